@@ -0,0 +1,59 @@
+"""
+Compares converting raw bytes against converting already-decoded strings.
+
+    python benchmarks/bytes_input.py [page.html ...]
+
+For each page it times decoding alone and full conversions from a str, from bytes
+(decoded by domscribe), from a memory-mapped file, and from bytes handed straight
+to BeautifulSoup (which runs its own charset detection). Without arguments a
+synthetic UTF-8 page is used.
+"""
+import mmap
+import os
+import sys
+import tempfile
+import timeit
+from bs4 import BeautifulSoup
+from domscribe import html_to_markdown
+from domscribe.input_utils import read_html
+
+def synthetic_page() -> bytes:
+    paragraphs = ''.join(
+        f"<p>Paragraph {i}: naïve café text with <a href='https://example.com/{i}'>a link</a> "
+        f"and <strong>bold</strong> words.</p>"
+        for i in range(2000)
+    )
+    return f"<html><head><meta charset='utf-8'></head><body>{paragraphs}</body></html>".encode('utf-8')
+
+def best(function, number: int = 3) -> float:
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+def measure(name: str, data: bytes) -> None:
+    text = read_html(data)
+    megabytes = len(data) / 1e6
+    with tempfile.NamedTemporaryFile(suffix='.html', delete=False) as f:
+        f.write(data)
+    try:
+        with open(f.name, 'rb') as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            timings = [
+                ('decode only (read_html)', best(lambda: read_html(data), 10)),
+                ('soup from bytes (bs4 detection)', best(lambda: BeautifulSoup(data, 'html.parser'))),
+                ('soup from read_html(bytes)', best(lambda: BeautifulSoup(read_html(data), 'html.parser'))),
+                ('html_to_markdown(str)', best(lambda: html_to_markdown(text))),
+                ('html_to_markdown(bytes)', best(lambda: html_to_markdown(data))),
+                ('html_to_markdown(mmap)', best(lambda: html_to_markdown(mapped))),
+            ]
+    finally:
+        os.unlink(f.name)
+
+    print(f"{name} ({megabytes:.2f} MB)")
+    for label, seconds in timings:
+        print(f"  {label:<34} {seconds * 1000:8.2f} ms  {megabytes / seconds:7.2f} MB/s")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            with open(path, 'rb') as f:
+                measure(path, f.read())
+    else:
+        measure('synthetic page', synthetic_page())
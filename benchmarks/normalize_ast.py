@@ -0,0 +1,60 @@
+"""
+Measures how much AST normalization shrinks the AST and speeds up rendering.
+
+    python benchmarks/normalize_ast.py [page.html ...]
+
+Without arguments a synthetic article-style page is used.
+"""
+import sys
+import timeit
+from bs4 import BeautifulSoup
+from domscribe import html_to_markdown_ast, markdown_ast_to_string
+from domscribe.ast_utils import normalize_markdown_ast
+
+def synthetic_page() -> str:
+    sections = []
+    for i in range(200):
+        sections.append(
+            f"<div class='section'><h2>Section {i}</h2>"
+            f"<p>Intro text for section {i} with <a href='https://example.com/{i}'>a link</a>, "
+            f"<strong>bold</strong> and <em>italic</em> words.<br>Second line.</p>"
+            f"<p>Another <span>paragraph</span> <span>made</span> <span>of</span> <span>spans</span>.</p>"
+            f"<ul><li>Item <b>one</b></li><li>Item two<br>continued</li></ul></div>"
+        )
+    return f"<html><body>{''.join(sections)}</body></html>"
+
+def count_nodes(nodes) -> int:
+    total = 0
+    for node in nodes:
+        total += 1
+        if isinstance(node.get('content'), list):
+            total += count_nodes(node['content'])
+        for item in node.get('items', []):
+            total += count_nodes(item['content'])
+        for row in node.get('rows', []):
+            for cell in row['cells']:
+                if isinstance(cell['content'], list):
+                    total += count_nodes(cell['content'])
+    return total
+
+def measure(name: str, html: str) -> None:
+    ast = html_to_markdown_ast(BeautifulSoup(html, 'html.parser'))
+    normalized = normalize_markdown_ast(ast)
+    assert markdown_ast_to_string(ast) == markdown_ast_to_string(normalized)
+
+    number = 20
+    raw_time = min(timeit.repeat(lambda: markdown_ast_to_string(ast), number=number, repeat=5)) / number
+    normalize_time = min(timeit.repeat(lambda: normalize_markdown_ast(ast), number=number, repeat=5)) / number
+    normalized_time = min(timeit.repeat(lambda: markdown_ast_to_string(normalized), number=number, repeat=5)) / number
+
+    print(f"{name}: {count_nodes(ast)} -> {count_nodes(normalized)} nodes, "
+          f"render {raw_time * 1000:.2f} ms -> {normalized_time * 1000:.2f} ms "
+          f"(+ {normalize_time * 1000:.2f} ms to normalize)")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                measure(path, f.read())
+    else:
+        measure('synthetic page', synthetic_page())
@@ -1,22 +1,79 @@
-from .converter import (
-    html_to_markdown,
-    convert_element_to_markdown,
-    find_in_markdown_ast,
-    find_all_in_markdown_ast
-)
-from .html_to_markdown_ast import html_to_markdown_ast
+import importlib
+import sys
+import types
 from .markdown_ast_to_string import markdown_ast_to_string
-from .dom_utils import find_main_content, wrap_main_content
+from .markdown_ast_to_text import markdown_ast_to_text
 from .url_utils import refify_urls
+from .ast_serialization import dumps_ast, loads_ast, save_ast, load_ast
+
+# Everything that needs BeautifulSoup is imported on first use, so that importing
+# only the renderers (e.g. to render a stored AST) does not pay for importing bs4.
+LAZY_ATTRIBUTES = {
+    "html_to_markdown": "converter",
+    "html_to_markdown_result": "converter",
+    "convert_element_to_markdown": "converter",
+    "find_in_markdown_ast": "converter",
+    "find_all_in_markdown_ast": "converter",
+    "find_main_content": "dom_utils",
+    "wrap_main_content": "dom_utils",
+    "html_to_markdown_incremental": "incremental",
+    "html_to_markdown_variants": "variants",
+    "MainContentSelectorCache": "selector_cache",
+    "fetch_and_convert": "pipeline",
+    "html_to_markdown_parallel": "parallel"
+}
+
+def __getattr__(name):
+    module_name = LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+class DomscribeModule(types.ModuleType):
+    # Importing the html_to_markdown_ast submodule binds the module object to this
+    # name on the package; the property keeps the name pointing at the function.
+    # Other assignments (e.g. from mock.patch) are kept until deleted.
+    @property
+    def html_to_markdown_ast(self):
+        if "html_to_markdown_ast_override" in self.__dict__:
+            return self.__dict__["html_to_markdown_ast_override"]
+        return importlib.import_module(".html_to_markdown_ast", __name__).html_to_markdown_ast
+
+    @html_to_markdown_ast.setter
+    def html_to_markdown_ast(self, value):
+        if not (isinstance(value, types.ModuleType) and value.__name__ == f"{__name__}.html_to_markdown_ast"):
+            self.__dict__["html_to_markdown_ast_override"] = value
+
+    @html_to_markdown_ast.deleter
+    def html_to_markdown_ast(self):
+        self.__dict__.pop("html_to_markdown_ast_override", None)
+
+sys.modules[__name__].__class__ = DomscribeModule
+
+def __dir__():
+    return sorted((set(globals()) - {"html_to_markdown_ast_override"}) | set(LAZY_ATTRIBUTES) | {"html_to_markdown_ast"})
 
 __all__ = [
     "html_to_markdown",
+    "html_to_markdown_result",
     "convert_element_to_markdown",
     "find_in_markdown_ast",
     "find_all_in_markdown_ast",
     "html_to_markdown_ast",
     "markdown_ast_to_string",
+    "markdown_ast_to_text",
     "find_main_content",
     "wrap_main_content",
-    "refify_urls"
+    "refify_urls",
+    "html_to_markdown_incremental",
+    "dumps_ast",
+    "loads_ast",
+    "save_ast",
+    "load_ast",
+    "html_to_markdown_variants",
+    "MainContentSelectorCache",
+    "fetch_and_convert",
+    "html_to_markdown_parallel"
 ]
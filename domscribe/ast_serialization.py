@@ -0,0 +1,136 @@
+import json
+import mmap
+import os
+from typing import Iterator, List, Sequence, Union
+from .markdown_types import SemanticMarkdownAST
+
+# Stored ASTs are JSON lines: a header line, then one top-level node per line.
+# The version is bumped whenever the node layout changes incompatibly.
+FORMAT_NAME = 'domscribe-ast'
+FORMAT_VERSION = 1
+
+def encode_header() -> str:
+    return json.dumps({'format': FORMAT_NAME, 'version': FORMAT_VERSION}, separators=(',', ':'))
+
+def check_header(line: Union[str, bytes]) -> None:
+    try:
+        header = json.loads(line)
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get('format') != FORMAT_NAME:
+        raise ValueError('Not a serialized domscribe AST')
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported AST format version: {header.get('version')!r} (expected {FORMAT_VERSION})")
+
+def dumps_ast(ast: Sequence[SemanticMarkdownAST]) -> str:
+    """
+    Serializes a Markdown AST to a string.
+
+    :param ast: The Markdown AST (a list of top-level nodes).
+    :return: The serialized AST.
+    """
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), check_circular=False)
+    return '\n'.join([encode_header()] + [encoder.encode(node) for node in ast]) + '\n'
+
+def loads_ast(data: Union[str, bytes]) -> List[SemanticMarkdownAST]:
+    """
+    Deserializes a Markdown AST produced by `dumps_ast`.
+
+    :param data: The serialized AST.
+    :return: The Markdown AST.
+    """
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    header, _, body = data.partition('\n')
+    check_header(header)
+    body = body.strip('\n')
+    if not body:
+        return []
+    # Decoding all nodes as one JSON array keeps the work inside the C decoder.
+    return json.loads('[' + body.replace('\n', ',') + ']')
+
+def save_ast(ast: Sequence[SemanticMarkdownAST], path: Union[str, os.PathLike]) -> None:
+    """
+    Writes a Markdown AST to a file.
+
+    :param ast: The Markdown AST.
+    :param path: The file to write.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(dumps_ast(ast))
+
+def load_ast(path: Union[str, os.PathLike], lazy: bool = False) -> Union[List[SemanticMarkdownAST], 'LazyAST']:
+    """
+    Reads a Markdown AST from a file.
+
+    :param path: The file to read.
+    :param lazy: Memory-map the file and decode nodes only when they are accessed.
+    :return: The Markdown AST, or a `LazyAST` when `lazy` is set.
+    """
+    if lazy:
+        return LazyAST(path)
+    with open(path, 'rb') as f:
+        return loads_ast(f.read())
+
+class LazyAST(Sequence):
+    """
+    A read-only, memory-mapped view of a stored Markdown AST.
+
+    Only the line offsets are read up front; each top-level node is decoded when it
+    is accessed. It can be passed straight to `markdown_ast_to_string`.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self._file = open(path, 'rb')
+        try:
+            if os.fstat(self._file.fileno()).st_size == 0:
+                raise ValueError('Not a serialized domscribe AST')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        header_end = self._map.find(b'\n')
+        check_header(self._map[:header_end if header_end != -1 else len(self._map)])
+
+        self._offsets: List[int] = []
+        start = header_end + 1 if header_end != -1 else len(self._map)
+        size = len(self._map)
+        while start < size:
+            end = self._map.find(b'\n', start)
+            if end == -1:
+                end = size
+            if end > start:
+                self._offsets.append(start)
+            start = end + 1
+
+    def _decode(self, index: int) -> SemanticMarkdownAST:
+        start = self._offsets[index]
+        end = self._map.find(b'\n', start)
+        return json.loads(self._map[start:end if end != -1 else len(self._map)])
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[SemanticMarkdownAST, List[SemanticMarkdownAST]]:
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('LazyAST index out of range')
+        return self._decode(index)
+
+    def __iter__(self) -> Iterator[SemanticMarkdownAST]:
+        for index in range(len(self)):
+            yield self._decode(index)
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'LazyAST':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
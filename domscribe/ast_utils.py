@@ -71,3 +71,102 @@ def get_main_content(markdown_str: str) -> str:
                 if end != -1:
                     markdown_str = markdown_str[:start] + markdown_str[end + len(f'</-{section[2:-2]}>'):]
         return markdown_str.strip()
+
+# Node types whose children are normalized, or that may render to nothing
+NORMALIZED_CONTAINER_TYPES = {'image', 'list', 'table', 'blockquote', 'semanticHtml', 'preservedHtml'}
+
+def normalize_markdown_ast(nodes: List[SemanticMarkdownAST], indent_level: int = 0,
+                           list_indent_level: Optional[int] = None) -> List[SemanticMarkdownAST]:
+    """
+    Merges adjacent text nodes and drops nodes that render to nothing.
+
+    `markdown_ast_to_string` renders the result exactly like the input. It prefixes
+    every text node with the indent of the list it is rendered in, so merged text
+    carries that indent inline and the indent level of each node list is tracked
+    here the same way the renderer does. Link contents are left alone, as their
+    rendering depends on the number of child nodes.
+
+    The input is not modified; unchanged nodes are reused in the result.
+
+    :param nodes: The Markdown AST to normalize.
+    :param indent_level: The indent level the nodes are rendered at.
+    :param list_indent_level: The indent level for nested lists, if different.
+    :return: The normalized Markdown AST, or `nodes` itself if nothing changed.
+    """
+    indent = ' ' * (indent_level * 2)
+    result: List[SemanticMarkdownAST] = []
+    changed = False
+
+    for node in nodes:
+        node_type = node['type']
+        if node_type in NORMALIZED_CONTAINER_TYPES:
+            if node_type == 'list' and list_indent_level is not None:
+                normalized = normalize_node(node, list_indent_level)
+            else:
+                normalized = normalize_node(node, indent_level)
+            if normalized is not node:
+                changed = True
+            if normalized is None:
+                continue
+        else:
+            normalized = node
+
+        previous = result[-1] if result else None
+        if (previous and node_type == 'text' and previous['type'] == 'text'
+                and isinstance(previous['content'], str) and previous['content'] not in ('', '.')
+                and isinstance(normalized['content'], str)):
+            # Same spacing rule as the inline branch of markdown_ast_to_string. A
+            # lone '.' is never merged into, since it is spaced differently.
+            text = normalized['content']
+            needs_space = not previous['content'][-1].isspace() and text != '.' and not (text and text[0].isspace())
+            result[-1] = {'type': 'text', 'content': previous['content'] + (' ' if needs_space else '') + indent + text}
+            changed = True
+        else:
+            result.append(normalized)
+
+    return result if changed else nodes
+
+def normalize_node(node: SemanticMarkdownAST, indent_level: int) -> Optional[SemanticMarkdownAST]:
+    """
+    Normalizes the children of a single node; returns None if it renders to nothing.
+    """
+    node_type = node['type']
+
+    if node_type == 'image':
+        return node if node['alt'].strip() or node['src'].strip() else None
+
+    if node_type == 'list':
+        items = []
+        for item in node['items']:
+            if any(subitem['type'] == 'list' for subitem in item['content']):
+                content = normalize_markdown_ast(item['content'], indent_level, indent_level + 1)
+            else:
+                content = normalize_markdown_ast(item['content'], indent_level + 1)
+            items.append(item if content is item['content'] else {**item, 'content': content})
+        if all(new is old for new, old in zip(items, node['items'])):
+            return node
+        return {**node, 'items': items}
+
+    if node_type == 'table':
+        if not node['rows']:
+            return None
+        rows = []
+        for row in node['rows']:
+            cells = []
+            for cell in row['cells']:
+                if isinstance(cell['content'], list):
+                    content = normalize_markdown_ast(cell['content'], indent_level + 1)
+                    cells.append(cell if content is cell['content'] else {**cell, 'content': content})
+                else:
+                    cells.append(cell)
+            rows.append(row if all(new is old for new, old in zip(cells, row['cells'])) else {**row, 'cells': cells})
+        if all(new is old for new, old in zip(rows, node['rows'])):
+            return node
+        return {**node, 'rows': rows}
+
+    if node_type in ['blockquote', 'semanticHtml', 'preservedHtml']:
+        # Blockquotes and semantic HTML render their content without indentation
+        content = normalize_markdown_ast(node['content'], indent_level if node_type == 'preservedHtml' else 0)
+        return node if content is node['content'] else {**node, 'content': content}
+
+    return node
@@ -0,0 +1,116 @@
+import json
+import socket
+import struct
+import subprocess
+import sys
+from typing import Any, BinaryIO, Dict, List, Optional
+from .markdown_types import ConversionOptions
+
+# Frames are a 4-byte big-endian length followed by that many bytes of UTF-8 JSON.
+# Requests are {"id", "html", "options"}; responses are {"id", "markdown"} or {"id", "error"}.
+HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 256 * 1024 * 1024
+
+class WorkerError(RuntimeError):
+    """
+    Raised when the worker server fails to convert a document.
+    """
+
+def write_frame(stream: BinaryIO, message: Dict[str, Any]) -> None:
+    data = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    stream.write(HEADER.pack(len(data)) + data)
+    stream.flush()
+
+def read_exactly(stream: BinaryIO, size: int) -> bytes:
+    data = b''
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+def read_frame(stream: BinaryIO) -> Optional[Dict[str, Any]]:
+    """
+    Reads one frame; returns None at end of stream.
+    """
+    header = read_exactly(stream, HEADER.size)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        raise WorkerError('Truncated frame header')
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise WorkerError(f'Frame too large: {size} bytes')
+    data = read_exactly(stream, size)
+    if len(data) < size:
+        raise WorkerError('Truncated frame')
+    return json.loads(data.decode('utf-8'))
+
+class ConversionClient:
+    """
+    A thin client for the worker server started with `python -m domscribe.server`.
+
+    It only depends on the standard library, so using it does not import bs4.
+    Connect to a server listening on a Unix socket with `ConversionClient(path)`,
+    or start a private server over stdin/stdout with `ConversionClient.spawn()`.
+    A client sends one request at a time; use one client per thread.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: Optional[float] = None):
+        self._socket = None
+        self._process = None
+        self._next_id = 0
+        if socket_path is not None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(timeout)
+            self._socket.connect(socket_path)
+            self._rfile = self._socket.makefile('rb')
+            self._wfile = self._socket.makefile('wb')
+
+    @classmethod
+    def spawn(cls, workers: Optional[int] = None, args: Optional[List[str]] = None) -> 'ConversionClient':
+        """
+        Starts a worker server as a child process and talks to it over stdin/stdout.
+        """
+        command = [sys.executable, '-m', 'domscribe.server', '--stdio']
+        if workers:
+            command += ['--workers', str(workers)]
+        client = cls()
+        client._process = subprocess.Popen(command + (args or []), stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        client._rfile = client._process.stdout
+        client._wfile = client._process.stdin
+        return client
+
+    def convert(self, html: str, options: Optional[ConversionOptions] = None) -> str:
+        """
+        Converts an HTML string to Markdown on the server.
+
+        :param html: The HTML string to convert.
+        :param options: Conversion options; must be JSON-serializable (no callbacks).
+        :return: The converted Markdown string.
+        """
+        self._next_id += 1
+        write_frame(self._wfile, {'id': self._next_id, 'html': html, 'options': options or {}})
+        response = read_frame(self._rfile)
+        if response is None:
+            raise WorkerError('Connection closed by the server')
+        if 'error' in response:
+            raise WorkerError(response['error'])
+        return response['markdown']
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._rfile.close()
+            self._wfile.close()
+            self._socket.close()
+        if self._process is not None:
+            self._wfile.close()
+            self._process.wait()
+            self._rfile.close()
+
+    def __enter__(self) -> 'ConversionClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,99 @@
+import re
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup, Tag
+from .markdown_ast_to_text import markdown_ast_to_text
+from .markdown_types import HeadingOutline, LinkInfo, ImageInfo, VideoInfo, TableInfo, SemanticMarkdownAST
+
+# A word is a whitespace-separated token with at least one letter or digit
+WORD = re.compile(r'\S*\w\S*')
+
+def count_words(text: str) -> int:
+    return len(WORD.findall(text))
+
+class ConversionCollector:
+    """
+    Gathers links, media, headings, tables and word counts while the AST is built.
+
+    Passed to `html_to_markdown_ast` as the `collector` option; the builder reports
+    each element it converts, so nothing walks the document a second time.
+    """
+
+    def __init__(self, website_domain: Optional[str] = None):
+        self.website_domain = website_domain
+        self.links: List[LinkInfo] = []
+        self.images: List[ImageInfo] = []
+        self.videos: List[VideoInfo] = []
+        self.tables: List[TableInfo] = []
+        self.headings: List[HeadingOutline] = []
+        self.word_count = 0
+        self._heading_stack: List[HeadingOutline] = []
+
+    def resolve(self, url: str) -> str:
+        return urljoin(self.website_domain, url) if self.website_domain and url else url
+
+    def add_text(self, text: str) -> None:
+        words = count_words(text)
+        self.word_count += words
+        if self._heading_stack:
+            self._heading_stack[-1]['word_count'] += words
+
+    def add_link(self, element: Tag, node: SemanticMarkdownAST) -> None:
+        # The text comes from the link's AST, which is already built, not from the DOM
+        self.links.append({'href': self.resolve(element.get('href', '')), 'text': markdown_ast_to_text(node['content'])})
+
+    def add_image(self, element: Tag) -> None:
+        self.images.append({'src': self.resolve(element.get('src', '')), 'alt': element.get('alt', '')})
+
+    def add_video(self, element: Tag) -> None:
+        src = element.get('src')
+        if not src:
+            source = element.find('source', src=True)
+            src = source['src'] if source else ''
+        poster = element.get('poster')
+        self.videos.append({
+            'src': self.resolve(src),
+            'poster': self.resolve(poster) if poster else None,
+            'controls': element.has_attr('controls')
+        })
+
+    def add_heading(self, level: int, text: str) -> None:
+        heading: HeadingOutline = {'level': level, 'text': text, 'word_count': 0, 'children': []}
+        while self._heading_stack and self._heading_stack[-1]['level'] >= level:
+            self._heading_stack.pop()
+        siblings = self._heading_stack[-1]['children'] if self._heading_stack else self.headings
+        siblings.append(heading)
+        self._heading_stack.append(heading)
+        self.word_count += count_words(text)
+
+    def add_table(self, node: SemanticMarkdownAST) -> None:
+        rows = node['rows']
+        header_cells = [cell for cell in rows[0]['cells'] if cell['type'] == 'tableHeaderCell'] if rows else []
+        self.tables.append({
+            'rows': len(rows),
+            'columns': max((len(row['cells']) for row in rows), default=0),
+            'headers': [markdown_ast_to_text(cell['content']) for cell in header_cells]
+        })
+
+def extract_metadata(soup: BeautifulSoup) -> Dict[str, Dict[str, str]]:
+    """
+    Reads the title and meta tags of the document head, grouped like the metadata
+    node: standard, Open Graph and Twitter tags.
+    """
+    metadata: Dict[str, Dict[str, str]] = {'standard': {}, 'openGraph': {}, 'twitter': {}}
+    if not soup.head:
+        return metadata
+    if soup.head.title and soup.head.title.string:
+        metadata['standard']['title'] = soup.head.title.string.strip()
+    for meta in soup.head.find_all('meta'):
+        name = meta.get('property') or meta.get('name')
+        content = meta.get('content')
+        if not name or content is None:
+            continue
+        if name.startswith('og:'):
+            metadata['openGraph'][name[3:]] = content
+        elif name.startswith('twitter:'):
+            metadata['twitter'][name[8:]] = content
+        else:
+            metadata['standard'][name] = content
+    return metadata
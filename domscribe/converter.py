@@ -1,18 +1,35 @@
+import hashlib
 import inspect
-from typing import Dict, Any, Optional, List
-from bs4 import BeautifulSoup
+import time
+from typing import Dict, Any, Optional, List, Tuple
+from bs4 import BeautifulSoup, Tag
 from .html_to_markdown_ast import html_to_markdown_ast
 from .markdown_ast_to_string import markdown_ast_to_string
-from .dom_utils import find_main_content, wrap_main_content
+from .markdown_ast_to_text import markdown_ast_to_text
+from .dom_utils import find_main_content, wrap_main_content, scope_strainer, outermost_elements, ElementGroup
 from .url_utils import refify_urls
-from .ast_utils import find_in_ast, find_all_in_ast
-from .markdown_types import ConversionOptions, SemanticMarkdownAST
+from .selector_cache import domain_key
+from .input_utils import HtmlSource, read_html
+from .collector import ConversionCollector, extract_metadata
+from .ast_utils import find_in_ast, find_all_in_ast, normalize_markdown_ast
+from .markdown_types import ConversionOptions, ConversionResult, SemanticMarkdownAST
 
-def html_to_markdown(html: str, options: Optional[ConversionOptions] = None) -> str:
+# Options that carry per-call state, helpers or input decoding hints rather than
+# affecting how a document is converted.
+RUNTIME_OPTION_KEYS = {'stage_timings', 'main_content_cache', 'encoding', 'collector'}
+
+def html_to_markdown(html: HtmlSource, options: Optional[ConversionOptions] = None) -> str:
     """
-    Converts an HTML string to Markdown.
+    Converts an HTML document to Markdown.
+
+    The document may be a string, raw bytes (or any bytes-like object such as an
+    `mmap`), or a `pathlib.Path`. Raw documents are decoded once using their BOM,
+    the `encoding` option or a `<meta>` charset.
+
+    Safe to call concurrently from several threads. Options may be shared between
+    calls, except `stage_timings`, which each call writes to.
     
-    :param html: The HTML string to convert.
+    :param html: The HTML document to convert.
     :param options: Conversion options.
     :return: The converted Markdown string.
     """
@@ -20,17 +37,150 @@ def html_to_markdown(html: str, options: Optional[ConversionOptions] = None) ->
         if options and options.get('debug'):
             print(f'{inspect.stack()[1][1]}:{inspect.stack()[1][2]}: {message}')
 
-    soup = BeautifulSoup(html, 'html.parser')
+    timings = options.get('stage_timings') if options else None
+    last = time.perf_counter()
+
+    def mark(stage: str):
+        nonlocal last
+        if timings is not None:
+            now = time.perf_counter()
+            timings[stage] = now - last
+            last = now
+
+    html = read_html(html, options.get('encoding') if options else None)
+    soup, element = parse_document(html, options)
+    mark('parse')
+    if element is None:
+        element = select_root_element(soup, options)
+    mark('select_root')
+    ast = build_markdown_ast(element, options)
+    mark('build_ast')
+    markdown = render_markdown_ast(ast, options).strip() + '\n'
+    mark('render')
+
+    return markdown
+
+def html_to_markdown_result(html: HtmlSource, options: Optional[ConversionOptions] = None) -> ConversionResult:
+    """
+    Converts an HTML document to Markdown and returns what was found along the way.
+
+    Links, images and videos (resolved against `website_domain`), the heading
+    outline, tables and word counts are collected while the AST is built, so they
+    cover exactly the converted content. Metadata is read from the document head.
+
+    :param html: The HTML document to convert.
+    :param options: Conversion options.
+    :return: The Markdown together with the collected information.
+    """
+    html = read_html(html, options.get('encoding') if options else None)
+    soup, element = parse_document(html, options)
+    if element is None:
+        element = select_root_element(soup, options)
+
+    collector = ConversionCollector(options.get('website_domain') if options else None)
+    ast = build_markdown_ast(element, {**(options or {}), 'collector': collector})
+
+    return {
+        'markdown': render_markdown_ast(ast, options).strip() + '\n',
+        'links': collector.links,
+        'images': collector.images,
+        'videos': collector.videos,
+        'headings': collector.headings,
+        'tables': collector.tables,
+        'metadata': extract_metadata(soup),
+        'word_count': collector.word_count
+    }
+
+def parse_document(html: str, options: Optional[ConversionOptions] = None) -> Tuple[BeautifulSoup, Optional[Tag]]:
+    """
+    Parses an HTML string, honouring the `scope` option.
+
+    With a simple `scope` (tag, id and classes, or a tag/attribute dict) only the
+    matching subtrees are built, using a SoupStrainer; other CSS selectors are
+    applied after a full parse. The contents of all outermost matches are converted,
+    separated by paragraph breaks.
+    If nothing matches, the whole document is parsed and `select_root_element`
+    falls back to main-content detection.
+
+    :param html: The HTML string.
+    :param options: Conversion options.
+    :return: The parsed document, and the element to convert if `scope` matched.
+    """
+    scope = options.get('scope') if options else None
+    if not scope:
+        return BeautifulSoup(html, 'html.parser'), None
+
+    strainer = scope_strainer(scope)
+    if strainer is not None:
+        soup = BeautifulSoup(html, 'html.parser', parse_only=strainer)
+        matches = [child for child in soup.children if isinstance(child, Tag)]
+    else:
+        soup = BeautifulSoup(html, 'html.parser')
+        matches = outermost_elements(soup.select(scope))
+
+    if matches:
+        return soup, matches[0] if len(matches) == 1 else ElementGroup(matches)
+    if strainer is not None:
+        soup = BeautifulSoup(html, 'html.parser')
+    return soup, None
+
+def select_root_element(soup: BeautifulSoup, options: Optional[ConversionOptions] = None,
+                        main_content: Optional[Tag] = None) -> Tag:
+    """
+    Picks the element of a parsed document that should be converted.
+
+    :param soup: The parsed document.
+    :param options: Conversion options.
+    :param main_content: The main content, if already known; detected when needed otherwise.
+    :return: The body, or the main content when `extract_main_content` is set
+             (or when a `scope` was given but matched nothing).
+    """
     element = soup.body or soup
 
-    if options and options.get('extract_main_content'):
-        element = find_main_content(soup)
-        if options.get('include_meta_data') and soup.head and not element.find('head'):
+    if main_content is None and should_detect_main_content(options):
+        main_content = select_main_content(soup, options)
+    if main_content is not None:
+        element = main_content
+        if options and options.get('include_meta_data') and soup.head and not element.find('head'):
             # Re-attach the head for meta-data extraction
             new_soup = BeautifulSoup(f"<html>{soup.head.prettify()}{element.prettify()}</html>", 'html.parser')
             element = new_soup.html
 
-    return convert_element_to_markdown(element, options).strip() + '\n'
+    return element
+
+def should_detect_main_content(options: Optional[ConversionOptions] = None) -> bool:
+    return bool(options and (options.get('extract_main_content') or options.get('scope')))
+
+def select_main_content(soup: BeautifulSoup, options: ConversionOptions) -> Tag:
+    # Without a domain there is no site to learn a selector for
+    main_content_cache = options.get('main_content_cache')
+    domain = domain_key(options.get('website_domain'))
+    if main_content_cache and domain:
+        return main_content_cache.find_main_content(soup, domain)
+    return find_main_content(soup)
+
+def options_fingerprint(options: Optional[ConversionOptions] = None) -> str:
+    """
+    Returns a stable hash of the conversion options.
+
+    Callables are identified by their qualified name, so the fingerprint is stable
+    across processes but does not see changes to a callback's behaviour. Options
+    that do not affect the output (`RUNTIME_OPTION_KEYS`) are ignored.
+
+    :param options: Conversion options.
+    :return: A hex digest.
+    """
+    def describe(value: Any) -> str:
+        if callable(value):
+            return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', repr(value))}"
+        if isinstance(value, dict):
+            return '{' + ','.join(f'{k!r}:{describe(v)}' for k, v in sorted(value.items())) + '}'
+        if isinstance(value, (list, tuple)):
+            return '[' + ','.join(describe(v) for v in value) + ']'
+        return repr(value)
+
+    options = {k: v for k, v in (options or {}).items() if k not in RUNTIME_OPTION_KEYS}
+    return hashlib.sha1(describe(options).encode('utf-8')).hexdigest()
 
 def convert_element_to_markdown(element: BeautifulSoup, options: Optional[ConversionOptions] = None) -> str:
     """
@@ -40,7 +190,51 @@ def convert_element_to_markdown(element: BeautifulSoup, options: Optional[Conver
     :param options: Conversion options.
     :return: The converted Markdown string.
     """
-    ast = html_to_markdown_ast(element, options)
+    ast = build_markdown_ast(element, options)
+    return render_markdown_ast(ast, options)
+
+def build_markdown_ast(element: Tag, options: Optional[ConversionOptions] = None, renders: int = 1) -> List[SemanticMarkdownAST]:
+    """
+    Builds the Markdown AST of an element, with text merged where it is free.
+
+    Adjacent text nodes outside lists, tables and links are merged while the AST is
+    built, which makes rendering cheaper without changing its output. The full
+    normalization pass, which also merges text inside lists and tables, costs about
+    as much as a render saves, so by default it only runs for an AST that will be
+    rendered more than once. `normalize_ast` forces both on or off. Neither is done
+    when a node renderer override is set, since the override would see different
+    nodes.
+
+    :param element: The BeautifulSoup element to convert.
+    :param options: Conversion options.
+    :param renders: How many times the AST is going to be rendered.
+    :return: The Markdown AST.
+    """
+    ast = html_to_markdown_ast(element, options, merge_text=should_merge_text(options))
+    if should_normalize_ast(options, renders):
+        ast = normalize_markdown_ast(ast)
+    return ast
+
+def should_merge_text(options: Optional[ConversionOptions] = None) -> bool:
+    if not options:
+        return True
+    return options.get('normalize_ast') is not False and not options.get('override_node_renderer')
+
+def should_normalize_ast(options: Optional[ConversionOptions] = None, renders: int = 1) -> bool:
+    if not options:
+        return renders > 1
+    return options.get('normalize_ast', renders > 1) and not options.get('override_node_renderer')
+
+def render_markdown_ast(ast: List[SemanticMarkdownAST], options: Optional[ConversionOptions] = None) -> str:
+    """
+    Renders a Markdown AST, applying the rendering-time options.
+
+    :param ast: The Markdown AST to render.
+    :param options: Conversion options (`refify_urls`, `plain_text` and the renderer hooks).
+    :return: The rendered Markdown, or plain text when `plain_text` is set.
+    """
+    if options and options.get('plain_text'):
+        return markdown_ast_to_text(ast)
 
     if options and options.get('refify_urls'):
         ast = refify_urls(ast)
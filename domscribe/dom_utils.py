@@ -1,5 +1,6 @@
-from typing import List
-from bs4 import BeautifulSoup, Tag
+import re
+from typing import Any, Dict, Iterator, List, Optional, Union
+from bs4 import BeautifulSoup, PageElement, SoupStrainer, Tag
 
 def find_main_content(document: BeautifulSoup) -> Tag:
     """
@@ -96,3 +97,61 @@ def wrap_main_content(main_content_element: Tag, document: BeautifulSoup):
         main_element = document.new_tag('main')
         main_content_element.wrap(main_element)
         main_element['id'] = 'detected-main-content'
+
+# Compound selectors that a SoupStrainer can express: tag, #id and .class parts
+SIMPLE_SELECTOR = re.compile(r'^(?P<name>[a-zA-Z][\w-]*)?(?:#(?P<id>[\w-]+))?(?P<classes>(?:\.[\w-]+)*)$')
+
+def scope_strainer(scope: Union[str, Dict[str, Any]]) -> Optional[SoupStrainer]:
+    """
+    Builds a SoupStrainer for a `scope` option, or returns None if the scope is a
+    CSS selector too complex to filter on while parsing.
+
+    A scope is either a simple selector such as `article`, `#content` or
+    `div.post.main`, or a dict with the SoupStrainer arguments `name` and `attrs`.
+    """
+    if isinstance(scope, dict):
+        return SoupStrainer(scope.get('name'), scope.get('attrs', {}))
+
+    match = SIMPLE_SELECTOR.match(scope.strip())
+    if not match or not any(match.groups()):
+        return None
+    attrs: Dict[str, Any] = {}
+    if match.group('id'):
+        attrs['id'] = match.group('id')
+    classes = [cls for cls in match.group('classes').split('.') if cls]
+    if classes:
+        def has_classes(value: Any) -> bool:
+            if value is None:
+                return False
+            values = value.split() if isinstance(value, str) else value
+            return all(cls in values for cls in classes)
+        attrs['class'] = has_classes
+    name = match.group('name')
+    return SoupStrainer(name.lower() if name else None, attrs)
+
+def outermost_elements(elements: List[Tag]) -> List[Tag]:
+    """
+    Drops elements nested in another element of the list (given in document order).
+    """
+    result: List[Tag] = []
+    for element in elements:
+        if not result or not any(parent is result[-1] for parent in element.parents):
+            result.append(element)
+    return result
+
+class ElementGroup:
+    """
+    Several elements converted one after another, as if their children were the
+    children of a single element, with a paragraph break between elements.
+    """
+
+    def __init__(self, elements: List[Tag]):
+        self.elements = elements
+
+    @property
+    def children(self) -> Iterator[PageElement]:
+        for index, element in enumerate(self.elements):
+            if index:
+                # An empty paragraph converts to a paragraph break
+                yield Tag(name='p')
+            yield from element.children
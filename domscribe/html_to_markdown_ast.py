@@ -1,148 +1,285 @@
 import inspect
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, Tag, PageElement
 from .markdown_types import SemanticMarkdownAST, ConversionOptions
+from .markdown_ast_to_text import NO_SPACE_BEFORE
 
-def html_to_markdown_ast(element: Tag, options: ConversionOptions = None, indent_level: int = 0) -> List[SemanticMarkdownAST]:
+# Elements that html_to_markdown_ast handles itself; anything else falls through to the
+# generic branch, which simply flattens the element's children into its parent.
+HANDLED_ELEMENTS = {
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'a', 'img', 'ul', 'ol', 'br', 'table',
+    'strong', 'b', 'em', 'i', 's', 'strike', 'code', 'blockquote',
+    'article', 'aside', 'details', 'figcaption', 'figure', 'footer', 'header', 'main',
+    'mark', 'nav', 'section', 'summary', 'time'
+}
+
+def html_to_markdown_ast(element: Tag, options: ConversionOptions = None, indent_level: int = 0,
+                         merge_text: bool = False) -> List[SemanticMarkdownAST]:
+    """
+    Converts the children of an element to Markdown AST nodes.
+
+    With `merge_text`, runs of adjacent text nodes are merged as they are appended
+    (see `TextMerger`), which makes the AST smaller and rendering cheaper. This is
+    only done where the renderer does not indent text: at the top level (the result
+    is assumed to be rendered there) and inside blockquotes and semantic elements,
+    but not in lists, tables, links or preserved HTML.
+    """
+    if not merge_text:
+        result: List[SemanticMarkdownAST] = []
+        for child in element.children:
+            result.extend(node_to_markdown_ast(child, options, indent_level))
+        return result
+
+    collector = options.get('collector') if options else None
+    merger = TextMerger()
+    add, add_text = merger.add, merger.add_text
+    for child in element.children:
+        if isinstance(child, Tag):
+            for node in node_to_markdown_ast(child, options, indent_level, True):
+                add(node)
+        else:
+            # Same as the string branch of node_to_markdown_ast, without the node
+            content = child.strip()
+            if content:
+                add_text(content)
+                if collector:
+                    collector.add_text(content)
+    return merger.finish()
+
+def merge_text_nodes(nodes: List[SemanticMarkdownAST]) -> List[SemanticMarkdownAST]:
+    """
+    Merges the runs of adjacent text nodes in a node list rendered without indentation.
+    """
+    merger = TextMerger()
+    for node in nodes:
+        merger.add(node)
+    result = merger.finish()
+    return result if len(result) < len(nodes) else nodes
+
+class TextMerger:
+    """
+    Collects AST nodes, merging each run of adjacent text nodes into one.
+
+    Text is joined the way both renderers space it, so the merged nodes render the
+    same with `markdown_ast_to_string` and `markdown_ast_to_text`. A run is broken
+    before text starting with punctuation that the plain-text renderer does not
+    space (other than a lone '.'), and after a lone '.' or an empty text, which the
+    Markdown renderer spaces differently.
+    """
+
+    def __init__(self):
+        self.nodes: List[SemanticMarkdownAST] = []
+        self.run: List[str] = []
+        self.run_node = None
+        self.last_char = ''
+
+    def add_text(self, content: str, node: SemanticMarkdownAST = None) -> None:
+        run = self.run
+        if (run and (len(run) > 1 or run[0] not in ('', '.'))
+                and not (content.startswith(NO_SPACE_BEFORE) and content != '.')):
+            # Same spacing rule as the inline branch of markdown_ast_to_string
+            if not self.last_char.isspace() and content != '.' and not content[:1].isspace():
+                run.append(' ')
+                self.last_char = ' '
+            run.append(content)
+            self.last_char = content[-1:] or self.last_char
+            self.run_node = None
+            return
+        self.flush()
+        self.run = [content]
+        self.run_node = node
+        self.last_char = content[-1:]
+
+    def add(self, node: SemanticMarkdownAST) -> None:
+        if node['type'] == 'text' and isinstance(node['content'], str):
+            self.add_text(node['content'], node)
+        else:
+            self.flush()
+            self.nodes.append(node)
+
+    def flush(self) -> None:
+        if self.run:
+            self.nodes.append(self.run_node or {'type': 'text', 'content': ''.join(self.run)})
+            self.run = []
+
+    def finish(self) -> List[SemanticMarkdownAST]:
+        self.flush()
+        return self.nodes
+
+def node_to_markdown_ast(child: PageElement, options: ConversionOptions = None, indent_level: int = 0,
+                         merge_text: bool = False) -> List[SemanticMarkdownAST]:
+    """
+    Converts a single child of an element (a tag or a string) to Markdown AST nodes.
+
+    With `merge_text`, the lists spliced into the result (e.g. a paragraph's content)
+    are merged, but the result itself is not (see `merge_text_nodes`).
+    """
     result: List[SemanticMarkdownAST] = []
-    
+
     def debug_log(message: str):
         if options and options.get('debug'):
             print(f'{inspect.stack()[1][1]}:{inspect.stack()[1][2]}: {message}')
 
-    for child in element.children:
-        if isinstance(child, Tag):
-            overridden_element_processing = options.get('override_element_processing') if options else None
-            if overridden_element_processing:
-                overridden_result = overridden_element_processing(child, options, indent_level)
-                if overridden_result:
-                    debug_log(f"Element Processing Overridden: '{child.name}'")
-                    result.extend(overridden_result)
-                    continue
-
-            if child.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                level = int(child.name[1])
-                content = child.get_text().strip()
+    collector = options.get('collector') if options else None
+
+    if isinstance(child, Tag):
+        overridden_element_processing = options.get('override_element_processing') if options else None
+        if overridden_element_processing:
+            overridden_result = overridden_element_processing(child, options, indent_level)
+            if overridden_result:
+                debug_log(f"Element Processing Overridden: '{child.name}'")
+                result.extend(overridden_result)
+                return result
+
+        if child.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+            level = int(child.name[1])
+            content = child.get_text().strip()
+            if content:
+                debug_log(f"Heading {level}: '{content}'")
+                result.append({'type': 'heading', 'level': level, 'content': content})
+                if collector:
+                    collector.add_heading(level, content)
+        elif child.name == 'p':
+            debug_log("Paragraph")
+            result.extend(html_to_markdown_ast(child, options, indent_level, merge_text))
+            result.append({'type': 'text', 'content': '\n\n'})
+        elif child.name == 'a':
+            debug_log(f"Link: '{child.get('href')}' with text '{child.get_text()}'")
+            href = child.get('href', '')
+            if options and options.get('website_domain') and href.startswith(options['website_domain']):
+                href = href[len(options['website_domain']):]
+            result.append({
+                'type': 'link',
+                'href': href,  # Keep the trailing slash
+                'content': html_to_markdown_ast(child, options, indent_level + 1)
+            })
+            if collector:
+                collector.add_link(child, result[-1])
+        elif child.name == 'img':
+            debug_log(f"Image: src='{child.get('src')}', alt='{child.get('alt')}'")
+            src = child.get('src', '')
+            if options and options.get('website_domain') and src.startswith(options['website_domain']):
+                src = src[len(options['website_domain']):]
+            result.append({
+                'type': 'image',
+                'src': src,
+                'alt': child.get('alt', '')
+            })
+            if collector:
+                collector.add_image(child)
+        elif child.name in ['ul', 'ol']:
+            debug_log(f"{'Unordered' if child.name == 'ul' else 'Ordered'} List")
+            result.append({
+                'type': 'list',
+                'ordered': child.name == 'ol',
+                'items': [{'type': 'listItem', 'content': html_to_markdown_ast(li, options, indent_level + 1)} for li in child.find_all('li', recursive=False)]
+            })
+        elif child.name == 'br':
+            debug_log("Line Break")
+            result.append({'type': 'text', 'content': '\n'})
+        elif child.name == 'table':
+            debug_log("Table")
+            rows = []
+            # Find all rows in the table, including those in thead and tbody
+            all_rows = child.find_all('tr', recursive=True)
+            for row in all_rows:
+                cells = []
+                for col_index, cell in enumerate(row.find_all(['th', 'td'], recursive=False)):
+                    cell_type = 'tableHeaderCell' if cell.name == 'th' else 'tableCell'
+                    cells.append({
+                        'type': cell_type,
+                        'content': html_to_markdown_ast(cell, options, indent_level + 1),
+                        'colId': str(col_index + 1)  # Add column number as colId
+                    })
+                rows.append({'type': 'tableRow', 'cells': cells})
+            result.append({'type': 'table', 'rows': rows})
+            if collector:
+                collector.add_table(result[-1])
+        else:
+            # Handle other elements
+            content = child.get_text().strip()
+            if collector:
+                if child.name in ['strong', 'b', 'em', 'i', 's', 'strike', 'code']:
+                    collector.add_text(content)
+                elif child.name == 'video':
+                    collector.add_video(child)
+            if child.name in ['strong', 'b']:
                 if content:
-                    debug_log(f"Heading {level}: '{content}'")
-                    result.append({'type': 'heading', 'level': level, 'content': content})
-            elif child.name == 'p':
-                debug_log("Paragraph")
-                result.extend(html_to_markdown_ast(child, options, indent_level))
-                result.append({'type': 'text', 'content': '\n\n'})
-            elif child.name == 'a':
-                debug_log(f"Link: '{child.get('href')}' with text '{child.get_text()}'")
-                href = child.get('href', '')
-                if options and options.get('website_domain') and href.startswith(options['website_domain']):
-                    href = href[len(options['website_domain']):]
-                result.append({
-                    'type': 'link',
-                    'href': href,  # Keep the trailing slash
-                    'content': html_to_markdown_ast(child, options, indent_level + 1)
-                })
-            elif child.name == 'img':
-                debug_log(f"Image: src='{child.get('src')}', alt='{child.get('alt')}'")
-                src = child.get('src', '')
-                if options and options.get('website_domain') and src.startswith(options['website_domain']):
-                    src = src[len(options['website_domain']):]
+                    debug_log(f"Bold: '{content}'")
+                    result.append({'type': 'bold', 'content': content})
+            elif child.name in ['em', 'i']:
+                if content:
+                    debug_log(f"Italic: '{content}'")
+                    result.append({'type': 'italic', 'content': content})
+            elif child.name in ['s', 'strike']:
+                if content:
+                    debug_log(f"Strikethrough: '{content}'")
+                    result.append({'type': 'strikethrough', 'content': content})
+            elif child.name == 'code':
+                if content:
+                    is_code_block = child.parent and child.parent.name == 'pre'
+                    debug_log(f"{'Code Block' if is_code_block else 'Inline Code'}: '{content}'")
+                    language = child.get('class', [])
+                    language = next((cls.replace('language-', '') for cls in language if cls.startswith('language-')), '')
+                    result.append({
+                        'type': 'code',
+                        'content': child.get_text().strip(),
+                        'language': language,
+                        'inline': not is_code_block
+                    })
+            elif child.name == 'blockquote':
+                debug_log("Blockquote")
                 result.append({
-                    'type': 'image',
-                    'src': src,
-                    'alt': child.get('alt', '')
+                    'type': 'blockquote',
+                    'content': html_to_markdown_ast(child, options, indent_level, merge_text)
                 })
-            elif child.name in ['ul', 'ol']:
-                debug_log(f"{'Unordered' if child.name == 'ul' else 'Ordered'} List")
+            elif child.name in ['article', 'aside', 'details', 'figcaption', 'figure', 'footer', 'header', 'main', 'mark', 'nav', 'section', 'summary', 'time']:
+                debug_log(f"Semantic HTML Element: '{child.name}'")
                 result.append({
-                    'type': 'list',
-                    'ordered': child.name == 'ol',
-                    'items': [{'type': 'listItem', 'content': html_to_markdown_ast(li, options, indent_level + 1)} for li in child.find_all('li', recursive=False)]
+                    'type': 'semanticHtml',
+                    'htmlType': child.name,
+                    'content': html_to_markdown_ast(child, options, indent_level, merge_text)
                 })
-            elif child.name == 'br':
-                debug_log("Line Break")
-                result.append({'type': 'text', 'content': '\n'})
-            elif child.name == 'table':
-                debug_log("Table")
-                rows = []
-                # Find all rows in the table, including those in thead and tbody
-                all_rows = child.find_all('tr', recursive=True)
-                for row in all_rows:
-                    cells = []
-                    for col_index, cell in enumerate(row.find_all(['th', 'td'], recursive=False)):
-                        cell_type = 'tableHeaderCell' if cell.name == 'th' else 'tableCell'
-                        cells.append({
-                            'type': cell_type,
-                            'content': html_to_markdown_ast(cell, options, indent_level + 1),
-                            'colId': str(col_index + 1)  # Add column number as colId
-                        })
-                    rows.append({'type': 'tableRow', 'cells': cells})
-                result.append({'type': 'table', 'rows': rows})
             else:
-                # Handle other elements
-                content = child.get_text().strip()
-                if child.name in ['strong', 'b']:
-                    if content:
-                        debug_log(f"Bold: '{content}'")
-                        result.append({'type': 'bold', 'content': content})
-                elif child.name in ['em', 'i']:
-                    if content:
-                        debug_log(f"Italic: '{content}'")
-                        result.append({'type': 'italic', 'content': content})
-                elif child.name in ['s', 'strike']:
-                    if content:
-                        debug_log(f"Strikethrough: '{content}'")
-                        result.append({'type': 'strikethrough', 'content': content})
-                elif child.name == 'code':
-                    if content:
-                        is_code_block = child.parent and child.parent.name == 'pre'
-                        debug_log(f"{'Code Block' if is_code_block else 'Inline Code'}: '{content}'")
-                        language = child.get('class', [])
-                        language = next((cls.replace('language-', '') for cls in language if cls.startswith('language-')), '')
-                        result.append({
-                            'type': 'code',
-                            'content': child.get_text().strip(),
-                            'language': language,
-                            'inline': not is_code_block
-                        })
-                elif child.name == 'blockquote':
-                    debug_log("Blockquote")
+                keep_html = options.get('keep_html', []) if options else []
+                if child.name in keep_html:
+                    debug_log(f"Preserving HTML Element: '{child.name}'")
+                    attrs = []
+                    for k, v in child.attrs.items():
+                        if k == 'class':
+                            class_value = ' '.join(v) if isinstance(v, list) else v
+                            attrs.append(f'class="{class_value}"')
+                        elif v:
+                            attrs.append(f'{k}="{v}"')
+                    attrs = ' '.join(attrs)
                     result.append({
-                        'type': 'blockquote',
-                        'content': html_to_markdown_ast(child, options, indent_level)
-                    })
-                elif child.name in ['article', 'aside', 'details', 'figcaption', 'figure', 'footer', 'header', 'main', 'mark', 'nav', 'section', 'summary', 'time']:
-                    debug_log(f"Semantic HTML Element: '{child.name}'")
-                    result.append({
-                        'type': 'semanticHtml',
-                        'htmlType': child.name,
-                        'content': html_to_markdown_ast(child, options, indent_level)
+                        'type': 'preservedHtml',
+                        'tag': child.name,
+                        'attrs': attrs,
+                        'content': html_to_markdown_ast(child, options, indent_level + 1)
                     })
                 else:
-                    keep_html = options.get('keep_html', []) if options else []
-                    if child.name in keep_html:
-                        debug_log(f"Preserving HTML Element: '{child.name}'")
-                        attrs = []
-                        for k, v in child.attrs.items():
-                            if k == 'class':
-                                class_value = ' '.join(v) if isinstance(v, list) else v
-                                attrs.append(f'class="{class_value}"')
-                            elif v:
-                                attrs.append(f'{k}="{v}"')
-                        attrs = ' '.join(attrs)
-                        result.append({
-                            'type': 'preservedHtml',
-                            'tag': child.name,
-                            'attrs': attrs,
-                            'content': html_to_markdown_ast(child, options, indent_level + 1)
-                        })
+                    unhandled_element_processing = options.get('process_unhandled_element') if options else None
+                    if unhandled_element_processing:
+                        debug_log(f"Processing Unhandled Element: '{child.name}'")
+                        result.extend(unhandled_element_processing(child, options, indent_level))
                     else:
-                        unhandled_element_processing = options.get('process_unhandled_element') if options else None
-                        if unhandled_element_processing:
-                            debug_log(f"Processing Unhandled Element: '{child.name}'")
-                            result.extend(unhandled_element_processing(child, options, indent_level))
-                        else:
-                            debug_log(f"Generic HTMLElement: '{child.name}'")
-                            result.extend(html_to_markdown_ast(child, options, indent_level + 1))
-        elif child.string and child.string.strip():
-            result.append({'type': 'text', 'content': child.string.strip()})
+                        debug_log(f"Generic HTMLElement: '{child.name}'")
+                        result.extend(html_to_markdown_ast(child, options, indent_level + 1, merge_text))
+    elif child.string and child.string.strip():
+        result.append({'type': 'text', 'content': child.string.strip()})
+        if collector:
+            collector.add_text(result[-1]['content'])
 
     return result
+
+def is_transparent_element(element: PageElement, options: ConversionOptions = None) -> bool:
+    """
+    Whether the element's AST is just the concatenation of its children's ASTs.
+    """
+    if not isinstance(element, Tag) or element.name in HANDLED_ELEMENTS:
+        return False
+    if options and (options.get('override_element_processing') or options.get('process_unhandled_element')):
+        return False
+    keep_html = options.get('keep_html', []) if options else []
+    return element.name not in keep_html
@@ -0,0 +1,245 @@
+import bisect
+import difflib
+import hashlib
+from typing import Dict, Iterator, List, Optional, Tuple
+from bs4 import BeautifulSoup, PageElement, Tag
+from .html_to_markdown_ast import node_to_markdown_ast, merge_text_nodes, is_transparent_element
+from .markdown_ast_to_string import markdown_ast_to_string
+from .converter import (
+    parse_document, select_root_element, options_fingerprint, should_merge_text, should_normalize_ast,
+    should_detect_main_content, select_main_content, render_markdown_ast
+)
+from .selector_cache import build_selector
+from .ast_utils import normalize_markdown_ast
+from .input_utils import HtmlSource, read_html
+from .markdown_types import (
+    BlockChange, BlockState, ConversionOptions, IncrementalResult, IncrementalState, SemanticMarkdownAST
+)
+
+STATE_VERSION = 2
+
+# A stored root selector is trusted while its match keeps this share of the text.
+MIN_ROOT_TEXT_RATIO = 0.5
+
+def iter_blocks(element: Tag, options: Optional[ConversionOptions] = None, indent_level: int = 0) -> Iterator[Tuple[PageElement, int]]:
+    """
+    Yields the independent blocks of an element together with their indent level.
+
+    Elements that only flatten their children into the parent (plain `div`s and the
+    like) are descended into, so that a change deep inside a wrapper only invalidates
+    the block it actually touches.
+    """
+    for child in element.children:
+        if is_transparent_element(child, options):
+            yield from iter_blocks(child, options, indent_level + 1)
+        else:
+            yield child, indent_level
+
+def hash_text(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+def block_offsets(html: str, blocks: List[PageElement], soup: Optional[BeautifulSoup] = None) -> List[Optional[int]]:
+    """
+    Finds the offset in the source HTML where each tag block starts.
+
+    Strings, tags without source positions and, when `soup` is given, tags that were
+    not parsed into it (e.g. from a re-parsed copy of the document) get None.
+    """
+    line_starts = [0]
+    position = html.find('\n')
+    while position != -1:
+        line_starts.append(position + 1)
+        position = html.find('\n', position + 1)
+
+    from_source: Dict[int, bool] = {}
+    starts: List[Optional[int]] = []
+    for block in blocks:
+        if soup is not None and isinstance(block, Tag):
+            parent = block.parent
+            if id(parent) not in from_source:
+                root = parent
+                while root is not None and root.parent is not None:
+                    root = root.parent
+                from_source[id(parent)] = root is soup
+            if not from_source[id(parent)]:
+                starts.append(None)
+                continue
+        if isinstance(block, Tag) and block.sourceline is not None and block.sourceline <= len(line_starts):
+            starts.append(line_starts[block.sourceline - 1] + block.sourcepos)
+        else:
+            starts.append(None)
+    return starts
+
+def hash_blocks(html: str, blocks: List[PageElement], soup: Optional[BeautifulSoup] = None,
+                contexts: Optional[List[str]] = None) -> List[str]:
+    """
+    Hashes each block by the slice of source HTML it was parsed from.
+
+    A tag's slice runs from its start tag to the start of the next tag block, which
+    avoids re-serializing the tree. Strings are hashed by their text, and tags without
+    source positions fall back to their serialized form, as do tags that were not
+    parsed into `soup` from `html`. Each block's entry in `contexts`, if given, is
+    hashed along with it.
+    """
+    starts = block_offsets(html, blocks, soup)
+    tag_starts = sorted(start for start in starts if start is not None)
+    hashes = []
+    for index, (block, start) in enumerate(zip(blocks, starts)):
+        context = contexts[index] if contexts else ''
+        if start is None:
+            hashes.append(hash_text(context + str(block)))
+        else:
+            next_index = bisect.bisect_right(tag_starts, start)
+            end = tag_starts[next_index] if next_index < len(tag_starts) else len(html)
+            hashes.append(hash_text(context + html[start:end]))
+    return hashes
+
+def block_context(block: PageElement, indent_level: int) -> str:
+    """
+    Describes what a block's AST depends on besides its own source: its indent level
+    and its parent (e.g. `code` becomes a fenced block inside `pre`).
+    """
+    parent = block.parent.name if block.parent is not None else ''
+    return f'{indent_level}:{parent}\0'
+
+def diff_blocks(old_hashes: List[str], new_hashes: List[str]) -> List[BlockChange]:
+    """
+    Lists the ranges of blocks that were replaced, inserted or deleted.
+    """
+    # Re-crawls usually differ in a small region, so only the middle goes to difflib.
+    prefix = 0
+    limit = min(len(old_hashes), len(new_hashes))
+    while prefix < limit and old_hashes[prefix] == new_hashes[prefix]:
+        prefix += 1
+    suffix = 0
+    while (suffix < limit - prefix
+           and old_hashes[len(old_hashes) - 1 - suffix] == new_hashes[len(new_hashes) - 1 - suffix]):
+        suffix += 1
+
+    matcher = difflib.SequenceMatcher(None, old_hashes[prefix:len(old_hashes) - suffix],
+                                      new_hashes[prefix:len(new_hashes) - suffix], autojunk=False)
+    return [
+        {'op': op, 'old_range': [prefix + i1, prefix + i2], 'new_range': [prefix + j1, prefix + j2]}
+        for op, i1, i2, j1, j2 in matcher.get_opcodes() if op != 'equal'
+    ]
+
+def html_to_markdown_incremental(html: HtmlSource, previous_state: Optional[IncrementalState] = None,
+                                 options: Optional[ConversionOptions] = None) -> IncrementalResult:
+    """
+    Converts an HTML string to Markdown, reusing the work of a previous conversion.
+
+    Blocks whose content hash is found in `previous_state` reuse the stored AST
+    fragment, and also the stored Markdown when the text before them ends the same
+    way. Everything else is rebuilt. The Markdown is identical to `html_to_markdown`.
+
+    With main-content extraction, the selector of the element picked last time is
+    tried before scoring the page again. It is kept while it matches and keeps at
+    least half of the text it had, so an edit that would make scoring pick another
+    element (without shrinking the old one) keeps converting the old one. The
+    document is still parsed in full, and a block is only reused when its source,
+    parent and indent level are unchanged.
+
+    :param html: The HTML document to convert (a string, bytes or a path).
+    :param previous_state: The `state` returned by an earlier call, or None.
+    :param options: Conversion options.
+    :return: The Markdown, the new state and the list of changed block ranges.
+    """
+    html = read_html(html, options.get('encoding') if options else None)
+    fingerprint = options_fingerprint(options)
+    if previous_state and (previous_state.get('version') != STATE_VERSION
+                           or previous_state.get('options_fingerprint') != fingerprint):
+        previous_state = None
+
+    document_hash = hash_text(html)
+    if previous_state and previous_state['document_hash'] == document_hash:
+        return {
+            'markdown': previous_state['markdown'],
+            'state': previous_state,
+            'changes': [],
+            'reused_blocks': len(previous_state['blocks']),
+            'rebuilt_blocks': 0
+        }
+
+    old_blocks: List[BlockState] = previous_state['blocks'] if previous_state else []
+    reusable: Dict[str, List[BlockState]] = {}
+    for old_block in reversed(old_blocks):
+        reusable.setdefault(old_block['hash'], []).append(old_block)
+
+    soup, element = parse_document(html, options)
+    root_selector = None
+    root_text_length = 0
+    if element is None:
+        main_content = None
+        if should_detect_main_content(options):
+            # Main-content scoring dominates small edits, so the previous pick is tried first
+            selector = previous_state.get('root_selector') if previous_state else None
+            if selector:
+                main_content = soup.select_one(selector)
+                if main_content is not None:
+                    root_text_length = len(main_content.get_text(strip=True))
+                    if root_text_length < MIN_ROOT_TEXT_RATIO * previous_state['root_text_length']:
+                        main_content = None
+            if main_content is None:
+                main_content = select_main_content(soup, options)
+                root_text_length = len(main_content.get_text(strip=True))
+            root_selector = build_selector(main_content)
+        element = select_root_element(soup, options, main_content)
+    elements = list(iter_blocks(element, options))
+    hashes = hash_blocks(html, [block for block, _ in elements], soup,
+                         [block_context(block, indent_level) for block, indent_level in elements])
+
+    blocks: List[BlockState] = []
+    cached: List[Optional[BlockState]] = []
+    rebuilt = 0
+    merge_text = should_merge_text(options)
+    for (block, indent_level), block_hash in zip(elements, hashes):
+        candidates = reusable.get(block_hash)
+        old_block = candidates.pop() if candidates else None
+        if old_block:
+            ast = old_block['ast']
+        else:
+            ast = node_to_markdown_ast(block, options, indent_level, merge_text)
+            if merge_text:
+                ast = merge_text_nodes(ast)
+            if should_normalize_ast(options):
+                ast = normalize_markdown_ast(ast)
+            rebuilt += 1
+        blocks.append({'hash': block_hash, 'ast': ast, 'preceding': '', 'markdown': ''})
+        cached.append(old_block)
+
+    if options and (options.get('refify_urls') or options.get('plain_text')):
+        # Reference numbers depend on every link before them, and plain text collapses
+        # whitespace across blocks, so the document is rendered as a whole; only the
+        # AST of unchanged blocks is saved.
+        ast: List[SemanticMarkdownAST] = [node for block in blocks for node in block['ast']]
+        markdown = render_markdown_ast(ast, options)
+    else:
+        parts = []
+        tail = ''
+        for block, old_block in zip(blocks, cached):
+            if old_block and old_block['preceding'] == tail:
+                block['markdown'] = old_block['markdown']
+            else:
+                block['markdown'] = markdown_ast_to_string(block['ast'], options, preceding=tail)
+            block['preceding'] = tail
+            parts.append(block['markdown'])
+            tail = block['markdown'][-1:] or tail
+        markdown = ''.join(parts)
+    markdown = markdown.strip() + '\n'
+
+    state: IncrementalState = {
+        'version': STATE_VERSION,
+        'options_fingerprint': fingerprint,
+        'document_hash': document_hash,
+        'markdown': markdown,
+        'blocks': blocks,
+        'root_selector': root_selector,
+        'root_text_length': root_text_length
+    }
+    return {
+        'markdown': markdown,
+        'state': state,
+        'changes': diff_blocks([b['hash'] for b in old_blocks], hashes),
+        'reused_blocks': len(blocks) - rebuilt,
+        'rebuilt_blocks': rebuilt
+    }
@@ -0,0 +1,97 @@
+import codecs
+import mmap
+import os
+import re
+from typing import Optional, Tuple, Union
+
+HtmlSource = Union[str, bytes, bytearray, memoryview, mmap.mmap, os.PathLike]
+
+# Longer BOMs first: the UTF-32 LE BOM starts with the UTF-16 LE one.
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+]
+META_CHARSET = re.compile(rb'<meta[^>]*?charset\s*=\s*["\']?\s*([a-zA-Z0-9_:.\-]+)', re.IGNORECASE)
+PRESCAN_BYTES = 1024
+
+def normalize_encoding(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip()).name
+    except LookupError:
+        return None
+
+def detect_charset(data: Union[bytes, bytearray, memoryview, mmap.mmap], hint: Optional[str] = None) -> Tuple[Optional[str], int]:
+    """
+    Detects the charset of an HTML document without decoding it.
+
+    Follows the precedence of the HTML spec: a byte order mark, then the caller's
+    hint (e.g. from the Content-Type header), then a `<meta>` charset within the
+    first 1024 bytes.
+
+    :param data: The raw document.
+    :param hint: An encoding name supplied by the caller.
+    :return: The encoding (or None if undetermined) and the length of the BOM to skip.
+    """
+    start = bytes(data[:4])
+    for bom, encoding in BOMS:
+        if start.startswith(bom):
+            return encoding, len(bom)
+
+    encoding = normalize_encoding(hint)
+    if encoding:
+        return encoding, 0
+
+    match = META_CHARSET.search(bytes(data[:PRESCAN_BYTES]))
+    if match:
+        encoding = normalize_encoding(match.group(1).decode('ascii'))
+        if encoding and encoding.startswith('utf-16'):
+            # A document that can be prescanned as ASCII isn't really UTF-16
+            encoding = 'utf-8'
+        if encoding:
+            return encoding, 0
+
+    return None, 0
+
+def decode_html(data: Union[bytes, bytearray, memoryview, mmap.mmap], hint: Optional[str] = None) -> str:
+    """
+    Decodes a raw HTML document in a single pass over the buffer.
+
+    The buffer is decoded in place, without first copying it into a bytes object.
+    Documents with no detectable charset are read as UTF-8, falling back to
+    windows-1252 if they are not valid UTF-8.
+    """
+    encoding, bom_length = detect_charset(data, hint)
+    buffer = memoryview(data)[bom_length:] if bom_length else data
+    if encoding:
+        return str(buffer, encoding, 'replace')
+    try:
+        return str(buffer, 'utf-8')
+    except UnicodeDecodeError:
+        return str(buffer, 'windows-1252', 'replace')
+
+def read_html(source: HtmlSource, encoding: Optional[str] = None) -> str:
+    """
+    Returns the HTML of a string, a bytes-like object (including `mmap`) or a path.
+
+    Strings are returned as they are; a plain `str` is always treated as HTML, so
+    pass paths as `pathlib.Path` objects. Files are memory-mapped and decoded
+    directly from the mapping.
+
+    :param source: The HTML document.
+    :param encoding: A charset hint for raw documents, e.g. from the HTTP headers.
+    :return: The HTML string.
+    """
+    if isinstance(source, str):
+        return source
+    if isinstance(source, os.PathLike):
+        with open(source, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ''
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return decode_html(mapped, encoding)
+    return decode_html(source, encoding)
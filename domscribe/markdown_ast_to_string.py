@@ -1,9 +1,20 @@
 import inspect
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence
 from .markdown_types import SemanticMarkdownAST, ConversionOptions
 
-def markdown_ast_to_string(nodes: List[SemanticMarkdownAST], options: ConversionOptions = None, indent_level: int = 0) -> str:
-    markdown_string = ''
+def markdown_ast_to_string(nodes: Sequence[SemanticMarkdownAST], options: ConversionOptions = None, indent_level: int = 0, preceding: str = '') -> str:
+    """
+    Renders Markdown AST nodes to a string.
+
+    `nodes` may be any sequence of nodes, including a stored AST opened with
+    `load_ast(path, lazy=True)`.
+
+    `preceding` is the Markdown already emitted before these nodes. Spacing decisions
+    only look at its last character, which lets callers render a document piecewise
+    and get the same result as rendering it in one go.
+    """
+    seed = preceding[-1:]
+    markdown_string = seed
 
     def debug_log(message: str):
         if options and options.get('debug'):
@@ -144,4 +155,4 @@ def markdown_ast_to_string(nodes: List[SemanticMarkdownAST], options: Conversion
             if not content.endswith(' '):
                 markdown_string += ' '
     
-    return markdown_string
+    return markdown_string[len(seed):]
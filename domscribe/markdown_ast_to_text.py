@@ -0,0 +1,56 @@
+import re
+from typing import List, Sequence
+from .markdown_types import SemanticMarkdownAST
+
+INLINE_TYPES = ['text', 'bold', 'italic', 'strikethrough', 'link', 'reflink', 'preservedHtml']
+NO_SPACE_BEFORE = ('.', ',', ';', ':', '!', '?', ')')
+
+def markdown_ast_to_text(nodes: Sequence[SemanticMarkdownAST]) -> str:
+    """
+    Renders Markdown AST nodes to plain text, e.g. for search indexing.
+
+    Formatting, link targets, images and table column markers are dropped; block
+    elements are separated by blank lines and list items and table rows by newlines.
+    """
+    parts: List[str] = []
+    collect_text(nodes, parts)
+    lines = [' '.join(line.split()) for line in ''.join(parts).split('\n')]
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
+
+def collect_text(nodes: Sequence[SemanticMarkdownAST], parts: List[str], list_depth: int = 0) -> None:
+    for node in nodes:
+        node_type = node['type']
+        if node_type in INLINE_TYPES:
+            if isinstance(node['content'], str):
+                content = node['content']
+                if not content.startswith(NO_SPACE_BEFORE):
+                    parts.append(' ')
+                parts.append(content)
+            else:
+                parts.append(' ')
+                collect_text(node['content'], parts, list_depth)
+        elif node_type == 'heading':
+            parts.append(f"\n\n{node['content']}\n\n")
+        elif node_type == 'code':
+            parts.append(f" {node['content']} " if node['inline'] else f"\n\n{node['content']}\n\n")
+        elif node_type == 'list':
+            for item in node['items']:
+                parts.append('\n')
+                collect_text(item['content'], parts, list_depth + 1)
+            if list_depth == 0:
+                parts.append('\n\n')
+        elif node_type == 'table':
+            parts.append('\n')
+            for row in node['rows']:
+                parts.append('\n')
+                for cell in row['cells']:
+                    if isinstance(cell['content'], list):
+                        collect_text(cell['content'], parts)
+                    else:
+                        parts.append(str(cell['content']))
+                    parts.append(' ')
+            parts.append('\n\n')
+        elif node_type in ['blockquote', 'semanticHtml']:
+            parts.append('\n\n')
+            collect_text(node['content'], parts)
+            parts.append('\n\n')
@@ -114,3 +114,79 @@ class ConversionOptions(TypedDict, total=False):
     override_node_renderer: Optional[callable]
     render_custom_node: Optional[callable]
     include_meta_data: Optional[Union[str, bool]]
+    plain_text: bool
+    main_content_cache: Optional[Any]
+    stage_timings: Dict[str, float]
+    normalize_ast: bool
+    encoding: Optional[str]
+    collector: Optional[Any]
+    scope: Optional[Union[str, Dict[str, Any]]]
+
+class BlockState(TypedDict):
+    hash: str
+    ast: List[SemanticMarkdownAST]
+    preceding: str
+    markdown: str
+
+class IncrementalState(TypedDict):
+    version: int
+    options_fingerprint: str
+    document_hash: str
+    markdown: str
+    blocks: List[BlockState]
+    root_selector: Optional[str]
+    root_text_length: int
+
+class BlockChange(TypedDict):
+    op: str
+    old_range: List[int]
+    new_range: List[int]
+
+class IncrementalResult(TypedDict):
+    markdown: str
+    state: IncrementalState
+    changes: List[BlockChange]
+    reused_blocks: int
+    rebuilt_blocks: int
+
+class LinkInfo(TypedDict):
+    href: str
+    text: str
+
+class ImageInfo(TypedDict):
+    src: str
+    alt: str
+
+class VideoInfo(TypedDict):
+    src: str
+    poster: Optional[str]
+    controls: bool
+
+class TableInfo(TypedDict):
+    rows: int
+    columns: int
+    headers: List[str]
+
+class HeadingOutline(TypedDict):
+    level: int
+    text: str
+    word_count: int
+    children: List['HeadingOutline']
+
+class ConversionResult(TypedDict):
+    markdown: str
+    links: List[LinkInfo]
+    images: List[ImageInfo]
+    videos: List[VideoInfo]
+    headings: List[HeadingOutline]
+    tables: List[TableInfo]
+    metadata: Dict[str, Dict[str, str]]
+    word_count: int
+
+class FetchResult(TypedDict):
+    url: str
+    markdown: Optional[str]
+    status_code: Optional[int]
+    error: Optional[str]
+    fetch_seconds: float
+    convert_seconds: float
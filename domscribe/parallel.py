@@ -0,0 +1,143 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+from bs4 import BeautifulSoup, PageElement
+from .html_to_markdown_ast import node_to_markdown_ast, merge_text_nodes
+from .markdown_ast_to_string import markdown_ast_to_string
+from .converter import (
+    html_to_markdown, parse_document, select_root_element, build_markdown_ast, should_merge_text, should_normalize_ast,
+    render_markdown_ast
+)
+from .incremental import iter_blocks, block_offsets
+from .ast_utils import normalize_markdown_ast
+from .input_utils import HtmlSource, read_html
+from .markdown_types import ConversionOptions, SemanticMarkdownAST
+
+# Pages shorter than this are converted serially. This is a starting point rather
+# than a measured break-even, which depends on the number of cores and the page.
+PARALLEL_THRESHOLD = 1_000_000
+
+# Each worker gets several chunks, so that one slow section does not leave the others idle.
+CHUNKS_PER_WORKER = 4
+
+# Set in each worker process by `init_worker`. The workers are forked, so the parsed
+# blocks reach them as they are: they keep their parents and nothing is re-parsed.
+worker_state: Dict[str, Any] = {}
+
+def html_to_markdown_parallel(html: HtmlSource, options: Optional[ConversionOptions] = None,
+                              max_workers: Optional[int] = None, min_size: int = PARALLEL_THRESHOLD) -> str:
+    """
+    Converts a large HTML document to Markdown using several worker processes.
+
+    The document is parsed once, its body is split into independent blocks, and
+    contiguous chunks of blocks are converted in worker processes. The chunks are
+    stitched in order, so the Markdown is identical to `html_to_markdown`. Documents
+    shorter than `min_size`, and platforms that cannot fork, are converted serially.
+    Each call starts its own pool, so calls from several threads do not interfere.
+
+    :param html: The HTML document to convert (a string, bytes or a path).
+    :param options: Conversion options.
+    :param max_workers: The number of worker processes (defaults to the CPU count).
+    :param min_size: The document length, in characters, from which workers are used.
+    :return: The Markdown string.
+    """
+    html = read_html(html, options.get('encoding') if options else None)
+    max_workers = max_workers or multiprocessing.cpu_count()
+    if len(html) < min_size or max_workers < 2 or 'fork' not in multiprocessing.get_all_start_methods():
+        return html_to_markdown(html, options)
+
+    soup, element = parse_document(html, options)
+    if element is None:
+        element = select_root_element(soup, options)
+    blocks = list(iter_blocks(element, options))
+    chunks = split_chunks(html, [block for block, _ in blocks], max_workers * CHUNKS_PER_WORKER, soup)
+    if len(chunks) < 2:
+        return render_markdown_ast(build_markdown_ast(element, options), options).strip() + '\n'
+
+    # Spacing depends on the text before each chunk, which is only known once the
+    # previous chunk is rendered. Workers assume a preceding newline, the usual case
+    # between blocks, and chunks that follow something else are rebuilt and
+    # re-rendered here, so workers only send back their Markdown.
+    whole_document = bool(options and (options.get('refify_urls') or options.get('plain_text')))
+    context = multiprocessing.get_context('fork')
+    with ProcessPoolExecutor(max_workers, mp_context=context, initializer=init_worker,
+                             initargs=(blocks, options, whole_document)) as executor:
+        results = list(executor.map(convert_chunk, chunks))
+
+    if whole_document:
+        # Reference numbers depend on every link before them, and plain text
+        # collapses whitespace across blocks, so the joined AST is rendered at once.
+        ast: List[SemanticMarkdownAST] = [node for chunk_ast in results for node in chunk_ast]
+        return render_markdown_ast(ast, options).strip() + '\n'
+
+    parts = []
+    tail = ''
+    for (start, end), markdown in zip(chunks, results):
+        if tail != assumed_preceding(start):
+            markdown = markdown_ast_to_string(build_chunk_ast(blocks[start:end], options), options, preceding=tail)
+        parts.append(markdown)
+        tail = markdown[-1:] or tail
+    return ''.join(parts).strip() + '\n'
+
+def split_chunks(html: str, blocks: List[PageElement], count: int,
+                 soup: Optional[BeautifulSoup] = None) -> List[Tuple[int, int]]:
+    """
+    Splits the blocks into about `count` contiguous ranges of similar source size.
+
+    :return: The (start, end) index range of each chunk.
+    """
+    starts = block_offsets(html, blocks, soup)
+    sizes = []
+    end = len(html)
+    for block, start in zip(reversed(blocks), reversed(starts)):
+        if start is None:
+            sizes.append(len(block.text))
+        else:
+            sizes.append(end - start)
+            end = start
+    sizes.reverse()
+
+    target = sum(sizes) / count if count else 0
+    chunks = []
+    chunk_start = 0
+    chunk_size = 0
+    for index, size in enumerate(sizes):
+        chunk_size += size
+        if chunk_size >= target:
+            chunks.append((chunk_start, index + 1))
+            chunk_start = index + 1
+            chunk_size = 0
+    if chunk_start < len(blocks):
+        chunks.append((chunk_start, len(blocks)))
+    return chunks
+
+def assumed_preceding(start: int) -> str:
+    return '' if start == 0 else '\n'
+
+def init_worker(blocks: List[Tuple[PageElement, int]], options: Optional[ConversionOptions], return_ast: bool) -> None:
+    worker_state.update(blocks=blocks, options=options, return_ast=return_ast)
+
+def build_chunk_ast(blocks: List[Tuple[PageElement, int]], options: Optional[ConversionOptions]) -> List[SemanticMarkdownAST]:
+    merge_text = should_merge_text(options)
+    ast: List[SemanticMarkdownAST] = []
+    for block, indent_level in blocks:
+        ast.extend(node_to_markdown_ast(block, options, indent_level, merge_text))
+    if merge_text:
+        ast = merge_text_nodes(ast)
+    if should_normalize_ast(options):
+        ast = normalize_markdown_ast(ast)
+    return ast
+
+def convert_chunk(chunk: Tuple[int, int]) -> Union[str, List[SemanticMarkdownAST]]:
+    """
+    Converts one chunk in a worker process.
+
+    :return: The chunk's AST when the whole document is rendered in the parent,
+             and its Markdown otherwise.
+    """
+    start, end = chunk
+    options = worker_state['options']
+    ast = build_chunk_ast(worker_state['blocks'][start:end], options)
+    if worker_state['return_ast']:
+        return ast
+    return markdown_ast_to_string(ast, options, preceding=assumed_preceding(start))
@@ -0,0 +1,170 @@
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import get_encoding_from_headers
+from .converter import html_to_markdown
+from .markdown_types import ConversionOptions, FetchResult
+
+def create_session(per_host_limit: int = 4, hosts: int = 32) -> requests.Session:
+    """
+    Creates a session that keeps up to `per_host_limit` connections open per host,
+    for up to `hosts` hosts.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=hosts, pool_maxsize=per_host_limit)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def convert_document(content: bytes, encoding: Optional[str], options: Optional[ConversionOptions]) -> Tuple[str, float]:
+    # Module-level so it can run on a process pool.
+    start = time.perf_counter()
+    markdown = html_to_markdown(content, {**(options or {}), 'encoding': encoding})
+    return markdown, time.perf_counter() - start
+
+def response_encoding(response: requests.Response) -> Optional[str]:
+    # requests falls back to ISO-8859-1 for any text/* response; only an explicit
+    # charset should override the document's own declaration.
+    if 'charset' not in response.headers.get('content-type', '').lower():
+        return None
+    return get_encoding_from_headers(response.headers)
+
+def fetch_and_convert(urls: Iterable[str], options: Optional[ConversionOptions] = None,
+                      fetch_workers: int = 8, per_host_limit: int = 4,
+                      convert_executor: Optional[Executor] = None, convert_workers: Optional[int] = None,
+                      session: Optional[requests.Session] = None, timeout: float = 30,
+                      max_pending: Optional[int] = None) -> Iterator[FetchResult]:
+    """
+    Fetches pages and converts them to Markdown, yielding results as they finish.
+
+    Downloads run on a thread pool sharing one pooled `requests.Session`, with at
+    most `per_host_limit` concurrent requests per host. Each downloaded page is
+    handed to `convert_executor` straight away, so conversions overlap with the
+    remaining downloads. The default executor is a thread pool; pass a
+    `ProcessPoolExecutor` to convert on several cores (the options must then be
+    picklable).
+
+    :param urls: The URLs to fetch.
+    :param options: Conversion options.
+    :param fetch_workers: Concurrent downloads in total.
+    :param per_host_limit: Concurrent downloads per host.
+    :param convert_executor: Executor for conversions; not shut down by this function.
+    :param convert_workers: Threads for the default conversion executor.
+    :param session: Session to fetch with; defaults to one from `create_session`.
+    :param timeout: Timeout per request, in seconds.
+    :param max_pending: Pages downloaded but not yet taken by the caller, at most
+                        (default: twice `fetch_workers`). Downloads wait while
+                        conversion or the caller lags behind.
+    :return: One result per URL, in completion order, with per-URL timings.
+        Closing the iterator early cancels the downloads that have not started, and
+        closes the default session once the running ones finish.
+    """
+    urls = list(urls)
+    own_session = session is None
+    session = session or create_session(per_host_limit)
+    own_executor = convert_executor is None
+    convert_executor = convert_executor or ThreadPoolExecutor(convert_workers)
+    fetch_executor = ThreadPoolExecutor(fetch_workers)
+
+    host_slots: Dict[str, threading.Semaphore] = {}
+    host_slots_lock = threading.Lock()
+    results: 'queue.Queue[FetchResult]' = queue.Queue()
+    pending = threading.Semaphore(max_pending or fetch_workers * 2)
+    closed = threading.Event()
+
+    def fetch(url: str) -> None:
+        result: FetchResult = {
+            'url': url, 'markdown': None, 'status_code': None, 'error': None,
+            'fetch_seconds': 0.0, 'convert_seconds': 0.0
+        }
+        pending.acquire()
+        if closed.is_set():
+            return
+        host = urlparse(url).netloc
+        with host_slots_lock:
+            slots = host_slots.setdefault(host, threading.Semaphore(per_host_limit))
+
+        start = time.perf_counter()
+        try:
+            with slots:
+                response = session.get(url, timeout=timeout)
+                content = response.content
+        except Exception as e:
+            result['fetch_seconds'] = time.perf_counter() - start
+            result['error'] = f'{type(e).__name__}: {e}'
+            results.put(result)
+            return
+        result['fetch_seconds'] = time.perf_counter() - start
+        result['status_code'] = response.status_code
+        if response.status_code >= 400:
+            result['error'] = f'HTTP {response.status_code}'
+            results.put(result)
+            return
+
+        def converted(future: Future) -> None:
+            try:
+                result['markdown'], result['convert_seconds'] = future.result()
+            except Exception as e:
+                result['error'] = f'{type(e).__name__}: {e}'
+            results.put(result)
+
+        try:
+            future = convert_executor.submit(convert_document, content, response_encoding(response), options)
+        except Exception as e:
+            result['error'] = f'{type(e).__name__}: {e}'
+            results.put(result)
+            return
+        future.add_done_callback(converted)
+
+    fetches = []
+    received = 0
+    try:
+        for url in urls:
+            fetches.append(fetch_executor.submit(fetch, url))
+        while received < len(urls):
+            result = results.get()
+            received += 1
+            pending.release()
+            yield result
+    finally:
+        finished = received == len(urls)
+        if not finished:
+            # Closed early: drop queued downloads and wake the ones waiting for a slot
+            closed.set()
+            for future in fetches:
+                future.cancel()
+            for _ in range(fetch_workers):
+                pending.release()
+        fetch_executor.shutdown(wait=finished)
+        if own_executor:
+            convert_executor.shutdown(wait=finished)
+        if own_session:
+            if finished:
+                session.close()
+            else:
+                close_when_done(fetches, session)
+
+def close_when_done(futures: List[Future], session: requests.Session) -> None:
+    """
+    Closes the session once the last of the fetches using it has finished or been cancelled.
+    """
+    remaining = len(futures)
+    lock = threading.Lock()
+
+    def done(_: Future) -> None:
+        nonlocal remaining
+        with lock:
+            remaining -= 1
+            last = remaining == 0
+        if last:
+            session.close()
+
+    if not futures:
+        session.close()
+    for future in futures:
+        future.add_done_callback(done)
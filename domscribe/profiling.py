@@ -0,0 +1,239 @@
+import argparse
+import cProfile
+import hashlib
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Union
+from .converter import html_to_markdown, options_fingerprint
+from .input_utils import HtmlSource, read_html
+from .markdown_types import ConversionOptions
+
+CAPTURE_FILE = 'capture.json'
+HTML_FILE = 'page.html'
+
+# tracemalloc is process-wide, so only one conversion at a time measures its memory.
+tracemalloc_lock = threading.Lock()
+
+def serializable_options(options: Optional[ConversionOptions]) -> Dict[str, Any]:
+    """
+    Returns the options that can be stored as JSON and replayed; callbacks are dropped.
+    """
+    def is_serializable(value: Any) -> bool:
+        if isinstance(value, (str, int, float, bool)) or value is None:
+            return True
+        if isinstance(value, (list, tuple)):
+            return all(is_serializable(v) for v in value)
+        if isinstance(value, dict):
+            return all(isinstance(k, str) and is_serializable(v) for k, v in value.items())
+        return False
+
+    return {k: v for k, v in (options or {}).items() if k != 'stage_timings' and is_serializable(v)}
+
+class ConversionCapture:
+    """
+    Wraps `html_to_markdown` and saves the inputs of slow conversions for replay.
+
+    A conversion is captured when it takes at least `latency_threshold` seconds or,
+    if `memory_threshold` is set, allocates at least that many bytes at peak (measured
+    with tracemalloc, which slows conversions down noticeably). Each capture is a
+    directory holding the HTML and a `capture.json` with the options, their
+    fingerprint and the stage timings.
+
+    Tracing is process-wide: while one conversion is measured, concurrent calls skip
+    the memory check, and the measured peak includes allocations made by other
+    threads in the meantime.
+
+    Captures are limited by `max_html_bytes` per page, `max_captures` and
+    `max_total_bytes` per directory, and at most one every `min_interval` seconds.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike], latency_threshold: float = 1.0,
+                 memory_threshold: Optional[int] = None, max_html_bytes: int = 5 * 1024 * 1024,
+                 max_captures: int = 100, max_total_bytes: int = 200 * 1024 * 1024, min_interval: float = 1.0):
+        self.directory = os.fspath(directory)
+        self.latency_threshold = latency_threshold
+        self.memory_threshold = memory_threshold
+        self.max_html_bytes = max_html_bytes
+        self.max_captures = max_captures
+        self.max_total_bytes = max_total_bytes
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._last_capture = float('-inf')
+
+        os.makedirs(self.directory, exist_ok=True)
+        captures = list_captures(self.directory)
+        self.captures = len(captures)
+        self.total_bytes = sum(os.path.getsize(os.path.join(path, HTML_FILE)) for path in captures)
+
+    def html_to_markdown(self, html: HtmlSource, options: Optional[ConversionOptions] = None) -> str:
+        """
+        Converts like `html_to_markdown`, capturing the page if it was slow.
+        """
+        html = read_html(html, options.get('encoding') if options else None)
+        timings: Dict[str, float] = {}
+        run_options: ConversionOptions = {**(options or {}), 'stage_timings': timings}
+
+        track_memory = (self.memory_threshold is not None and not tracemalloc.is_tracing()
+                        and tracemalloc_lock.acquire(blocking=False))
+        if track_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            markdown = html_to_markdown(html, run_options)
+        finally:
+            elapsed = time.perf_counter() - start
+            peak_memory = None
+            if track_memory:
+                peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                tracemalloc_lock.release()
+
+        if elapsed >= self.latency_threshold or (peak_memory is not None and peak_memory >= self.memory_threshold):
+            self.capture(html, options, timings, elapsed, peak_memory)
+        return markdown
+
+    def capture(self, html: str, options: Optional[ConversionOptions], timings: Dict[str, float],
+                elapsed: float, peak_memory: Optional[int] = None) -> Optional[str]:
+        """
+        Writes a capture if the limits allow it.
+
+        :return: The capture directory, or None if it was skipped.
+        """
+        data = html.encode('utf-8')
+        with self._lock:
+            now = time.monotonic()
+            if (len(data) > self.max_html_bytes
+                    or self.captures >= self.max_captures
+                    or self.total_bytes + len(data) > self.max_total_bytes
+                    or now - self._last_capture < self.min_interval):
+                return None
+            self._last_capture = now
+            self.captures += 1
+            self.total_bytes += len(data)
+
+        digest = hashlib.sha1(data).hexdigest()[:12]
+        path = os.path.join(self.directory, f'{int(time.time() * 1000)}-{digest}')
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, HTML_FILE), 'wb') as f:
+            f.write(data)
+        with open(os.path.join(path, CAPTURE_FILE), 'w', encoding='utf-8') as f:
+            json.dump({
+                'options': serializable_options(options),
+                'options_fingerprint': options_fingerprint(options),
+                'timings': timings,
+                'elapsed': elapsed,
+                'peak_memory': peak_memory,
+                'html_bytes': len(data)
+            }, f, indent=2)
+        return path
+
+def list_captures(directory: Union[str, os.PathLike]) -> List[str]:
+    directory = os.fspath(directory)
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if os.path.isfile(os.path.join(directory, name, CAPTURE_FILE))
+    )
+
+def module_name(filename: str) -> str:
+    """
+    Groups a profiled function's file into a report bucket.
+    """
+    parts = os.path.normpath(filename).split(os.sep)
+    if 'domscribe' in parts[:-1]:
+        return os.path.splitext(parts[-1])[0]
+    if 'bs4' in parts or 'soupsieve' in parts:
+        return 'bs4'
+    if parts[-2:] == ['html', 'parser.py']:
+        return 'html.parser'
+    return 'other'
+
+def replay_captures(directory: Union[str, os.PathLike], repeat: int = 1) -> Dict[str, Any]:
+    """
+    Re-runs captured conversions under cProfile.
+
+    :param directory: The capture directory.
+    :param repeat: How many times to convert each page.
+    :return: A report with the self time per module, in total and per capture.
+    """
+    report: Dict[str, Any] = {'pages': 0, 'modules': defaultdict(float), 'captures': {}}
+    for path in list_captures(directory):
+        with open(os.path.join(path, CAPTURE_FILE), encoding='utf-8') as f:
+            capture = json.load(f)
+        with open(os.path.join(path, HTML_FILE), encoding='utf-8', newline='') as f:
+            html = f.read()
+
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        profile.enable()
+        for _ in range(repeat):
+            html_to_markdown(html, capture['options'])
+        profile.disable()
+        elapsed = (time.perf_counter() - start) / repeat
+
+        modules: Dict[str, float] = defaultdict(float)
+        for (filename, _, _), (_, _, self_time, _, _) in pstats.Stats(profile).stats.items():
+            modules[module_name(filename)] += self_time / repeat
+        for module, seconds in modules.items():
+            report['modules'][module] += seconds
+        report['captures'][os.path.basename(path)] = {
+            'elapsed': elapsed,
+            'captured_elapsed': capture['elapsed'],
+            'modules': dict(modules)
+        }
+        report['pages'] += 1
+
+    report['modules'] = dict(report['modules'])
+    return report
+
+def compare_reports(report: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """
+    Compares the per-module times of two replay reports.
+
+    :return: For each module, the baseline and current seconds and their ratio.
+    """
+    comparison = {}
+    for module in sorted(set(report['modules']) | set(baseline['modules'])):
+        current = report['modules'].get(module, 0.0)
+        previous = baseline['modules'].get(module, 0.0)
+        comparison[module] = {
+            'baseline': previous,
+            'current': current,
+            'ratio': current / previous if previous else float('inf') if current else 1.0
+        }
+    return comparison
+
+def format_report(report: Dict[str, Any], comparison: Optional[Dict[str, Dict[str, float]]] = None) -> str:
+    lines = [f"{report['pages']} captured page(s)", '']
+    modules = sorted(report['modules'].items(), key=lambda item: item[1], reverse=True)
+    for module, seconds in modules:
+        line = f'{module:<24} {seconds * 1000:10.1f} ms'
+        if comparison and module in comparison:
+            line += f"   (baseline {comparison[module]['baseline'] * 1000:.1f} ms, x{comparison[module]['ratio']:.2f})"
+        lines.append(line)
+    return '\n'.join(lines)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Replay captured slow conversions under cProfile.')
+    parser.add_argument('directory', help='capture directory')
+    parser.add_argument('--repeat', type=int, default=1, help='conversions per page')
+    parser.add_argument('--baseline', help='previous report (JSON) to compare against')
+    parser.add_argument('--save', help='write this report (JSON) for later comparison')
+    args = parser.parse_args(argv)
+
+    report = replay_captures(args.directory, args.repeat)
+    comparison = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            comparison = compare_reports(report, json.load(f))
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    print(format_report(report, comparison))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+import json
+import os
+import threading
+from collections import Counter
+from typing import Dict, Optional, Union
+from urllib.parse import urlparse
+import soupsieve
+from bs4 import BeautifulSoup, Tag
+from .dom_utils import detect_main_content
+from typing_extensions import TypedDict
+
+CACHE_VERSION = 1
+
+class SiteEntry(TypedDict):
+    selector: Optional[str]
+    observations: Dict[str, int]
+    pages: int
+    text_length: float
+    failures: int
+
+def domain_key(website_domain: Optional[str]) -> str:
+    """
+    Returns the cache key for a `website_domain` option value.
+    """
+    if not website_domain:
+        return ''
+    return urlparse(website_domain).netloc or website_domain
+
+def build_selector(element: Tag) -> str:
+    """
+    Builds a CSS selector for an element from stable parts of its ancestry.
+
+    The path stops at the closest ancestor with an id, or at the body. Tag names and
+    classes are used for each step, with `:nth-of-type` only where needed to tell
+    same-named siblings apart.
+    """
+    parts = []
+    node = element
+    while node is not None and node.name not in ('[document]', 'html'):
+        if node.name == 'body':
+            parts.append('body')
+            break
+        if node.get('id'):
+            parts.append(f"{node.name}#{soupsieve.escape(node['id'])}")
+            break
+        part = node.name + ''.join(f'.{soupsieve.escape(cls)}' for cls in node.get('class', []))
+        if node.parent is not None:
+            siblings = node.parent.find_all(node.name, recursive=False)
+            if len(siblings) > 1:
+                part += f':nth-of-type({next(i for i, s in enumerate(siblings) if s is node) + 1})'
+        parts.append(part)
+        node = node.parent
+    return ' > '.join(reversed(parts))
+
+class MainContentSelectorCache:
+    """
+    Learns, per site, a selector for the element that main-content detection picks.
+
+    Sites are told apart by the `website_domain` option; conversions without it do
+    not use the cache.
+
+    For the first `learn_pages` pages of a site the main content is scored as usual
+    and the chosen element's selector recorded. Once one selector accounts for at
+    least `min_agreement` of those pages it is used directly. A page falls back to
+    scoring when the selector matches nothing or the match has less than
+    `min_text_ratio` of the text seen while learning; after `learn_pages`
+    consecutive fallbacks the site is learned again.
+
+    The cache is safe to share between threads.
+    """
+
+    def __init__(self, learn_pages: int = 5, min_agreement: float = 0.8, min_text_ratio: float = 0.25):
+        self.learn_pages = learn_pages
+        self.min_agreement = min_agreement
+        self.min_text_ratio = min_text_ratio
+        self.sites: Dict[str, SiteEntry] = {}
+        self.hits = 0
+        self.fallbacks = 0
+        self.learned = 0
+        self._lock = threading.Lock()
+
+    def find_main_content(self, document: BeautifulSoup, domain: str) -> Tag:
+        """
+        Same as `find_main_content`, but skips scoring when the site's selector matches.
+
+        :param document: The parsed page.
+        :param domain: The site the page belongs to, e.g. from `domain_key`.
+        """
+        if not domain:
+            raise ValueError("A domain is required to look up a learned selector")
+
+        main_element = document.find('main')
+        if main_element:
+            return main_element
+
+        with self._lock:
+            entry = self.sites.get(domain)
+            selector = entry['selector'] if entry else None
+            text_length = entry['text_length'] if entry else 0.0
+
+        if selector:
+            element = document.select_one(selector)
+            if element is not None and len(element.get_text(strip=True)) >= self.min_text_ratio * text_length:
+                with self._lock:
+                    self.hits += 1
+                    entry['failures'] = 0
+                return element
+
+        element = detect_main_content(document.body or document)
+        self.record(domain, element, fallback=bool(selector))
+        return element
+
+    def record(self, domain: str, element: Tag, fallback: bool = False) -> None:
+        selector = build_selector(element)
+        length = len(element.get_text(strip=True))
+        with self._lock:
+            entry = self.sites.setdefault(domain, {
+                'selector': None, 'observations': {}, 'pages': 0, 'text_length': 0.0, 'failures': 0
+            })
+            if fallback:
+                self.fallbacks += 1
+                entry['failures'] += 1
+                if entry['failures'] < self.learn_pages:
+                    return
+                entry.update({'selector': None, 'observations': {}, 'pages': 0, 'text_length': 0.0, 'failures': 0})
+            elif entry['selector']:
+                return
+
+            self.learned += 1
+            entry['observations'][selector] = entry['observations'].get(selector, 0) + 1
+            entry['text_length'] += (length - entry['text_length']) / (entry['pages'] + 1)
+            entry['pages'] += 1
+            if entry['pages'] >= self.learn_pages:
+                best, count = Counter(entry['observations']).most_common(1)[0]
+                if count >= self.min_agreement * entry['pages']:
+                    entry['selector'] = best
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Returns lookup counts: selector hits, fallbacks to scoring and learning pages.
+        """
+        with self._lock:
+            total = self.hits + self.fallbacks + self.learned
+            return {
+                'hits': self.hits,
+                'fallbacks': self.fallbacks,
+                'learned': self.learned,
+                'hit_rate': self.hits / total if total else 0.0,
+                'sites': len(self.sites),
+                'learned_sites': sum(1 for entry in self.sites.values() if entry['selector'])
+            }
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        with self._lock:
+            data = {
+                'version': CACHE_VERSION,
+                'learn_pages': self.learn_pages,
+                'min_agreement': self.min_agreement,
+                'min_text_ratio': self.min_text_ratio,
+                'sites': self.sites
+            }
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> 'MainContentSelectorCache':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != CACHE_VERSION:
+            raise ValueError(f"Unsupported selector cache version: {data.get('version')!r}")
+        cache = cls(data['learn_pages'], data['min_agreement'], data['min_text_ratio'])
+        cache.sites = data['sites']
+        return cache
@@ -0,0 +1,149 @@
+import argparse
+import multiprocessing
+import os
+import socketserver
+import sys
+import threading
+from typing import Any, BinaryIO, Dict, List, Optional
+from .client import read_frame, write_frame
+from .markdown_types import ConversionOptions
+
+def warm_up() -> None:
+    # Runs once in each worker so the first request doesn't pay for the imports.
+    from . import converter  # noqa: F401
+
+def convert_request(html: str, options: Optional[ConversionOptions]) -> Dict[str, Any]:
+    from .converter import html_to_markdown
+    try:
+        return {'markdown': html_to_markdown(html, options)}
+    except Exception as e:
+        return {'error': f'{type(e).__name__}: {e}'}
+
+class ConversionServer:
+    """
+    Converts documents on a pool of worker processes started up front.
+
+    At most `max_pending` requests are queued or running at once; beyond that the
+    server stops reading new requests until a worker frees up, which pushes back on
+    clients through the socket or pipe.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = multiprocessing.Pool(self.workers, initializer=warm_up)
+        self.slots = threading.BoundedSemaphore(max_pending or self.workers * 2)
+
+    def submit(self, request: Dict[str, Any], callback) -> None:
+        """
+        Queues a request; `callback` receives the response from a pool thread.
+        """
+        self.slots.acquire()
+
+        def done(result: Dict[str, Any]):
+            self.slots.release()
+            callback({'id': request.get('id'), **result})
+
+        def failed(error: BaseException):
+            self.slots.release()
+            callback({'id': request.get('id'), 'error': f'{type(error).__name__}: {error}'})
+
+        self.pool.apply_async(convert_request, (request.get('html', ''), request.get('options')),
+                              callback=done, error_callback=failed)
+
+    def convert(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        finished = threading.Event()
+        responses: List[Dict[str, Any]] = []
+
+        def callback(response: Dict[str, Any]):
+            responses.append(response)
+            finished.set()
+
+        self.submit(request, callback)
+        finished.wait()
+        return responses[0]
+
+    def serve_stdio(self, rfile: BinaryIO, wfile: BinaryIO) -> None:
+        """
+        Serves framed requests from `rfile` until it is closed.
+
+        Requests are processed concurrently, so responses may arrive out of order;
+        clients match them by id.
+        """
+        write_lock = threading.Lock()
+        pending = threading.Semaphore(0)
+        submitted = 0
+
+        def respond(response: Dict[str, Any]):
+            with write_lock:
+                write_frame(wfile, response)
+            pending.release()
+
+        while True:
+            request = read_frame(rfile)
+            if request is None:
+                break
+            self.submit(request, respond)
+            submitted += 1
+
+        for _ in range(submitted):
+            pending.acquire()
+
+    def serve_unix_socket(self, path: str) -> 'socketserver.ThreadingUnixStreamServer':
+        """
+        Creates a threaded server on a Unix socket; call `serve_forever()` on it.
+
+        Each connection is served one request at a time, so a client sees its
+        responses in order.
+        """
+        conversion_server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                while True:
+                    request = read_frame(self.rfile)
+                    if request is None:
+                        break
+                    write_frame(self.wfile, conversion_server.convert(request))
+
+        if os.path.exists(path):
+            os.unlink(path)
+        server = socketserver.ThreadingUnixStreamServer(path, Handler)
+        server.daemon_threads = True
+        return server
+
+    def close(self) -> None:
+        self.pool.close()
+        self.pool.join()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Run a long-lived domscribe conversion server.')
+    transport = parser.add_mutually_exclusive_group(required=True)
+    transport.add_argument('--socket', help='listen on this Unix socket path')
+    transport.add_argument('--stdio', action='store_true', help='serve framed requests on stdin/stdout')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--max-pending', type=int, help='requests queued or running at once (default: 2 per worker)')
+    args = parser.parse_args(argv)
+
+    if args.stdio:
+        # Keep the protocol on a private copy of stdout and point descriptor 1 at
+        # stderr, so that anything printed here or in the workers (e.g. with the
+        # `debug` option) cannot corrupt the frames.
+        sys.stdout.flush()
+        protocol = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    server = ConversionServer(args.workers, args.max_pending)
+    try:
+        if args.stdio:
+            server.serve_stdio(sys.stdin.buffer, protocol)
+        else:
+            with server.serve_unix_socket(args.socket) as socket_server:
+                try:
+                    socket_server.serve_forever()
+                except KeyboardInterrupt:
+                    pass
+    finally:
+        server.close()
+
+if __name__ == '__main__':
+    main()
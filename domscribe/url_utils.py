@@ -27,10 +27,21 @@ def process_url(url: str, prefixes_to_refs: Dict[str, str]) -> str:
     else:
         return url
 
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Sequence
 from .markdown_types import SemanticMarkdownAST, LinkNode
 
-def refify_urls(markdown_element: Union[SemanticMarkdownAST, List[SemanticMarkdownAST]]) -> Union[SemanticMarkdownAST, List[SemanticMarkdownAST]]:
+def refify_urls(markdown_element: Union[SemanticMarkdownAST, Sequence[SemanticMarkdownAST]]) -> Union[SemanticMarkdownAST, List[SemanticMarkdownAST]]:
+    """
+    Turns links into numbered reference links and appends the reference list.
+
+    The input is not modified: changed nodes are copied along the path to each
+    link, and unchanged subtrees are shared with the result, so one AST can be
+    refified and rendered several times, or from several threads.
+    """
+    if isinstance(markdown_element, Sequence) and not isinstance(markdown_element, (list, str)):
+        # E.g. a lazily loaded AST; its nodes are decoded as they are read
+        markdown_element = list(markdown_element)
+
     url_map: Dict[str, int] = {}
     url_counter = 1
 
@@ -38,7 +49,8 @@ def refify_urls(markdown_element: Union[SemanticMarkdownAST, List[SemanticMarkdo
         nonlocal url_counter
 
         if isinstance(element, list):
-            return [process_element(item) for item in element]
+            processed = [process_element(item) for item in element]
+            return element if all(new is old for new, old in zip(processed, element)) else processed
 
         if isinstance(element, dict):
             if element.get('type') == 'link':
@@ -47,21 +59,27 @@ def refify_urls(markdown_element: Union[SemanticMarkdownAST, List[SemanticMarkdo
                     url_map[url] = url_counter
                     url_counter += 1
                 ref_number = url_map[url]
-                
-                # Modify the original link content to use the reference style
+
+                # Build the reference-style link from the original link content
                 if element['content'] and isinstance(element['content'], list) and element['content'][0]['type'] == 'text':
-                    element['content'][0]['content'] = element['content'][0]['content'].strip()
+                    first = element['content'][0]
+                    content = [{**first, 'content': first['content'].strip()}] + element['content'][1:]
                 else:
-                    element['content'] = [{
+                    content = [{
                         'type': 'text',
                         'content': ''.join(item.get('content', '') for item in element.get('content', [])).strip()
                     }]
-                element['href'] = f'[{ref_number}]'  # Use reference number as href
-                element['type'] = 'reflink'  # Change the type to 'reflink'
-                return element
+                return {
+                    **element,
+                    'type': 'reflink',  # Change the type to 'reflink'
+                    'href': f'[{ref_number}]',  # Use reference number as href
+                    'content': content
+                }
 
             if 'content' in element:
-                element['content'] = process_element(element['content'])
+                content = process_element(element['content'])
+                if content is not element['content']:
+                    return {**element, 'content': content}
 
         return element
 
@@ -69,14 +87,13 @@ def refify_urls(markdown_element: Union[SemanticMarkdownAST, List[SemanticMarkdo
 
     # Add reference links at the end
     if isinstance(processed_ast, list):
-        processed_ast.append({'type': 'newline'})
         reference_links = []
         for url, ref_number in url_map.items():
             reference_links.append(f"[{ref_number}]: {url}")
-        processed_ast.append({
-            'type': 'text',
-            'content': '\n'.join(reference_links)
-        })
-        processed_ast.append({'type': 'newline'})
+        processed_ast = processed_ast + [
+            {'type': 'newline'},
+            {'type': 'text', 'content': '\n'.join(reference_links)},
+            {'type': 'newline'}
+        ]
 
     return processed_ast
@@ -0,0 +1,65 @@
+from collections import Counter
+from typing import Dict, Optional, Tuple
+from bs4 import BeautifulSoup, Tag
+from .converter import parse_document, select_root_element, build_markdown_ast, render_markdown_ast, options_fingerprint
+from .input_utils import HtmlSource, read_html
+from .markdown_types import ConversionOptions
+
+# Options that change which element is converted or the AST built from it. The
+# remaining options only affect rendering, so variants differing in those share an AST.
+ROOT_OPTION_KEYS = ['extract_main_content', 'include_meta_data']
+AST_OPTION_KEYS = [
+    'website_domain', 'keep_html', 'override_element_processing', 'process_unhandled_element',
+    'normalize_ast', 'override_node_renderer'
+]
+
+def html_to_markdown_variants(html: HtmlSource, variants: Dict[str, ConversionOptions],
+                              options: Optional[ConversionOptions] = None) -> Dict[str, str]:
+    """
+    Converts an HTML string to several renderings from a single parse.
+
+    The document is parsed once per distinct `scope` (usually once), main content is
+    detected at most once per parse, and one AST is built per distinct combination
+    of AST-affecting options. ASTs shared by several Markdown variants are
+    normalized, unless `normalize_ast` says otherwise.
+
+    :param html: The HTML document to convert (a string, bytes or a path).
+    :param variants: Maps each variant name to its options, which are merged over `options`.
+    :param options: Options shared by all variants.
+    :return: Maps each variant name to its Markdown (or plain text, with `plain_text`).
+    """
+    html = read_html(html, options.get('encoding') if options else None)
+    parses: Dict[str, Tuple[BeautifulSoup, Optional[Tag]]] = {}
+    roots: Dict[Tuple, Tag] = {}
+    asts: Dict[Tuple, list] = {}
+    results: Dict[str, str] = {}
+
+    keys: Dict[str, Tuple[ConversionOptions, Tuple, Tuple]] = {}
+    for name, variant_options in variants.items():
+        merged: ConversionOptions = {**(options or {}), **(variant_options or {})}
+        scope_key = options_fingerprint({'scope': merged.get('scope')})
+        if scope_key not in parses:
+            parses[scope_key] = parse_document(html, merged)
+        # A matched scope replaces root selection
+        if parses[scope_key][1] is not None:
+            root_key = (scope_key,)
+        else:
+            root_key = (scope_key,) + tuple(bool(merged.get(key)) for key in ROOT_OPTION_KEYS)
+        ast_key = (root_key, options_fingerprint({key: merged.get(key) for key in AST_OPTION_KEYS}))
+        keys[name] = (merged, root_key, ast_key)
+    # Normalization keeps the Markdown identical but not plain text, so an AST that a
+    # plain-text variant renders is not normalized
+    renders = Counter(ast_key for _, _, ast_key in keys.values())
+    for merged, _, ast_key in keys.values():
+        if merged.get('plain_text'):
+            renders[ast_key] = 1
+
+    for name, (merged, root_key, ast_key) in keys.items():
+        if root_key not in roots:
+            soup, scoped_element = parses[root_key[0]]
+            roots[root_key] = scoped_element if scoped_element is not None else select_root_element(soup, merged)
+        if ast_key not in asts:
+            asts[ast_key] = build_markdown_ast(roots[root_key], merged, renders[ast_key])
+        results[name] = render_markdown_ast(asts[ast_key], merged).strip() + '\n'
+
+    return results
@@ -0,0 +1,42 @@
+import pytest
+from bs4 import BeautifulSoup
+from domscribe import html_to_markdown_ast, markdown_ast_to_string, dumps_ast, loads_ast, save_ast, load_ast, refify_urls
+
+HTML = """
+<h1>Title</h1>
+<p>Some <strong>bold</strong> text and <a href="https://example.com">a link</a>.</p>
+<ul><li>One</li><li>Two <ol><li>Nested</li></ol></li></ul>
+<table><tr><th>A</th></tr><tr><td>Café\nline</td></tr></table>
+"""
+
+def build_ast():
+    return html_to_markdown_ast(BeautifulSoup(HTML, 'html.parser'))
+
+def test_dumps_loads_roundtrip():
+    ast = build_ast()
+    assert loads_ast(dumps_ast(ast)) == ast
+    assert loads_ast(dumps_ast([])) == []
+
+def test_loads_rejects_unknown_version():
+    data = dumps_ast(build_ast()).replace('"version":1', '"version":99', 1)
+    with pytest.raises(ValueError):
+        loads_ast(data)
+
+def test_lazy_load_renders_like_original(tmp_path):
+    ast = build_ast()
+    path = tmp_path / 'page.ast'
+    save_ast(ast, path)
+    assert load_ast(path) == ast
+    with load_ast(path, lazy=True) as lazy_ast:
+        assert len(lazy_ast) == len(ast)
+        assert lazy_ast[-1] == ast[-1]
+        assert markdown_ast_to_string(lazy_ast) == markdown_ast_to_string(ast)
+
+def test_lazy_load_refifies_like_original(tmp_path):
+    ast = build_ast()
+    path = tmp_path / 'page.ast'
+    save_ast(ast, path)
+    with load_ast(path, lazy=True) as lazy_ast:
+        markdown = markdown_ast_to_string(refify_urls(lazy_ast))
+    assert markdown == markdown_ast_to_string(refify_urls(ast))
+    assert '[1]: https://example.com' in markdown
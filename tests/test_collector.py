@@ -0,0 +1,50 @@
+from domscribe import html_to_markdown, html_to_markdown_result
+
+HTML = """
+<html>
+<head>
+  <title>Page title</title>
+  <meta name="description" content="A test page">
+  <meta property="og:title" content="OG title">
+</head>
+<body>
+  <h1>Guide</h1>
+  <p>Read <a href="/docs/start">the docs</a> or <a href="https://other.org/x">elsewhere</a>.</p>
+  <h2>Media</h2>
+  <p><img src="/img/a.png" alt="A picture"> Two words.</p>
+  <video controls poster="/img/poster.jpg"><source src="/media/clip.mp4"></video>
+  <h2>Data</h2>
+  <table>
+    <tr><th>Name</th><th>Value</th></tr>
+    <tr><td>a</td><td>1</td></tr>
+  </table>
+</body>
+</html>
+"""
+
+def test_result_markdown_matches_html_to_markdown():
+    options = {'website_domain': 'https://example.com'}
+    assert html_to_markdown_result(HTML, options)['markdown'] == html_to_markdown(HTML, options)
+
+def test_result_collects_links_and_media():
+    result = html_to_markdown_result(HTML, {'website_domain': 'https://example.com'})
+    assert result['links'] == [
+        {'href': 'https://example.com/docs/start', 'text': 'the docs'},
+        {'href': 'https://other.org/x', 'text': 'elsewhere'},
+    ]
+    assert result['images'] == [{'src': 'https://example.com/img/a.png', 'alt': 'A picture'}]
+    assert result['videos'] == [{
+        'src': 'https://example.com/media/clip.mp4',
+        'poster': 'https://example.com/img/poster.jpg',
+        'controls': True
+    }]
+
+def test_result_collects_outline_tables_and_metadata():
+    result = html_to_markdown_result(HTML)
+    assert [heading['text'] for heading in result['headings']] == ['Guide']
+    assert [child['text'] for child in result['headings'][0]['children']] == ['Media', 'Data']
+    assert result['headings'][0]['children'][0]['word_count'] == 2
+    assert result['tables'] == [{'rows': 2, 'columns': 2, 'headers': ['Name', 'Value']}]
+    assert result['metadata']['standard'] == {'title': 'Page title', 'description': 'A test page'}
+    assert result['metadata']['openGraph'] == {'title': 'OG title'}
+    assert result['word_count'] == 14
@@ -0,0 +1,86 @@
+from unittest import mock
+from domscribe import html_to_markdown, html_to_markdown_incremental
+
+
+def make_page(middle):
+    return f"""
+    <html><body><div id="page">
+      <h1>Title</h1>
+      <p>First paragraph with <a href="https://example.com/a">a link</a>.</p>
+      <p>{middle}</p>
+      <ul><li>One</li><li>Two</li></ul>
+    </div></body></html>
+    """
+
+def test_incremental_matches_full_conversion():
+    html = make_page("Middle paragraph.")
+    result = html_to_markdown_incremental(html)
+    assert result['markdown'] == html_to_markdown(html)
+    assert result['reused_blocks'] == 0
+
+def test_incremental_rebuilds_only_changed_blocks():
+    first = html_to_markdown_incremental(make_page("Middle paragraph."))
+    html = make_page("Changed <strong>middle</strong> paragraph.")
+    second = html_to_markdown_incremental(html, first['state'])
+    assert second['markdown'] == html_to_markdown(html)
+    assert second['rebuilt_blocks'] == 1
+    assert [change['op'] for change in second['changes']] == ['replace']
+
+def test_incremental_unchanged_document():
+    html = make_page("Middle paragraph.")
+    first = html_to_markdown_incremental(html)
+    second = html_to_markdown_incremental(html, first['state'])
+    assert second['markdown'] == first['markdown']
+    assert second['changes'] == []
+    assert second['rebuilt_blocks'] == 0
+
+def test_incremental_ignores_state_from_other_options():
+    html = make_page("Middle paragraph.")
+    first = html_to_markdown_incremental(html)
+    options = {'refify_urls': True}
+    second = html_to_markdown_incremental(html, first['state'], options)
+    assert second['markdown'] == html_to_markdown(html, options)
+    assert second['reused_blocks'] == 0
+
+def test_incremental_with_meta_data_reparse():
+    # Main content with meta data is converted from a re-parsed copy of the document,
+    # whose source positions do not point into the original HTML.
+    def page(middle):
+        nav = '\n'.join(f'<li><a href="/n{i}">Nav {i}</a></li>' for i in range(400))
+        paragraphs = [f'<p>{"Long paragraph text. " * 40}{i}</p>' for i in range(6)]
+        content = '\n'.join(paragraphs[:3] + [f'<p>{middle}</p>'] + paragraphs[3:])
+        return (f'<html><head><title>T</title></head><body><nav><ul>{nav}</ul></nav>'
+                f'<div class="content">{content}</div></body></html>')
+
+    options = {'extract_main_content': True, 'include_meta_data': True}
+    first = html_to_markdown_incremental(page('Middle one'), options=options)
+    html = page('Middle two')
+    second = html_to_markdown_incremental(html, first['state'], options)
+    assert second['markdown'] == html_to_markdown(html, options)
+    assert 'Middle two' in second['markdown']
+
+def test_incremental_rebuilds_blocks_whose_parent_changed():
+    first = html_to_markdown_incremental('<pre>Run <code>x = 1</code><b>y</b></pre>')
+    html = '<div>Run <code>x = 1</code><b>y</b></div>'
+    assert html_to_markdown_incremental(html, first['state'])['markdown'] == html_to_markdown(html)
+
+def test_incremental_reuses_main_content_selector():
+    def page(middle):
+        sections = ''.join(f'<section><h2>Part {i}</h2><p>{"Body text. " * 20}</p></section>' for i in range(20))
+        return f'<html><body><nav><a href="/">Home</a></nav><div class="article">{sections}<p>{middle}</p></div></body></html>'
+
+    options = {'extract_main_content': True}
+    first = html_to_markdown_incremental(page('Middle one'), options=options)
+    html = page('Middle two')
+    with mock.patch('domscribe.incremental.select_main_content') as select_main_content:
+        second = html_to_markdown_incremental(html, first['state'], options)
+    select_main_content.assert_not_called()
+    assert second['markdown'] == html_to_markdown(html, options)
+
+def test_incremental_plain_text():
+    options = {'plain_text': True}
+    html = '<p>Hello <b>world</b></p><h2>T</h2>'
+    first = html_to_markdown_incremental(html, None, options)
+    assert first['markdown'] == html_to_markdown(html, options) == 'Hello world\n\nT\n'
+    changed = '<p>Hello <b>there</b></p><h2>T</h2>'
+    assert html_to_markdown_incremental(changed, first['state'], options)['markdown'] == html_to_markdown(changed, options)
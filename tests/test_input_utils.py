@@ -0,0 +1,36 @@
+import codecs
+import mmap
+import pytest
+from domscribe import html_to_markdown
+from domscribe.input_utils import detect_charset, read_html
+
+HTML = "<html><head><meta charset='{charset}'></head><body><p>Café – naïve</p></body></html>"
+
+@pytest.mark.parametrize("data, hint, expected", [
+    (codecs.BOM_UTF8 + b'<p>x</p>', 'latin-1', ('utf-8', 3)),
+    (codecs.BOM_UTF16_LE + '<p>x</p>'.encode('utf-16-le'), None, ('utf-16-le', 2)),
+    (b'<meta charset="windows-1251"><p>x</p>', None, ('cp1251', 0)),
+    (b'<meta http-equiv="Content-Type" content="text/html; charset=ISO-8859-1">', None, ('iso8859-1', 0)),
+    (b'<meta charset="windows-1251"><p>x</p>', 'utf-8', ('utf-8', 0)),
+    (b'<p>x</p>', None, (None, 0)),
+])
+def test_detect_charset(data, hint, expected):
+    assert detect_charset(data, hint) == expected
+
+def test_html_to_markdown_accepts_bytes():
+    expected = html_to_markdown(HTML.format(charset='windows-1252'))
+    assert html_to_markdown(HTML.format(charset='windows-1252').encode('windows-1252')) == expected
+    assert html_to_markdown(HTML.format(charset='utf-8').encode('utf-8')) == expected
+    data = HTML.format(charset='').encode('windows-1252')
+    assert html_to_markdown(data, {'encoding': 'windows-1252'}) == expected
+
+def test_html_to_markdown_accepts_paths_and_mmap(tmp_path):
+    expected = html_to_markdown(HTML.format(charset='utf-8'))
+    path = tmp_path / 'page.html'
+    path.write_bytes(HTML.format(charset='utf-8').encode('utf-8'))
+    assert html_to_markdown(path) == expected
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert html_to_markdown(mapped) == expected
+
+def test_read_html_undeclared_non_utf8_falls_back():
+    assert read_html('<p>Café</p>'.encode('windows-1252')) == '<p>Café</p>'
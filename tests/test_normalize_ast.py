@@ -0,0 +1,49 @@
+import copy
+from bs4 import BeautifulSoup
+from domscribe import html_to_markdown, html_to_markdown_ast, markdown_ast_to_string
+from domscribe.ast_utils import normalize_markdown_ast
+
+HTML = """
+<p>First line<br>second line with <b>bold</b>.</p>
+<p>Check out <a href="https://example.com">this link</a>.</p>
+<ul><li>Item <span>one</span><br>more</li><li>Two<ul><li>Nested <span>text</span></li></ul></li></ul>
+<table><tr><td><p>a</p><p>b</p></td></tr></table>
+<table></table><img src="" alt="">
+<blockquote><p>Quoted</p><p>text</p></blockquote>
+"""
+
+def build_ast():
+    return html_to_markdown_ast(BeautifulSoup(HTML, 'html.parser'))
+
+def test_normalize_preserves_rendering():
+    ast = build_ast()
+    normalized = normalize_markdown_ast(ast)
+    assert markdown_ast_to_string(normalized) == markdown_ast_to_string(ast)
+    assert len(normalized) < len(ast)
+
+def test_normalize_does_not_modify_input():
+    ast = build_ast()
+    original = copy.deepcopy(ast)
+    normalize_markdown_ast(ast)
+    assert ast == original
+
+def test_normalize_merges_text_and_drops_empty_nodes():
+    normalized = normalize_markdown_ast([
+        {'type': 'text', 'content': 'a'},
+        {'type': 'image', 'src': '', 'alt': ''},
+        {'type': 'text', 'content': 'b'},
+        {'type': 'text', 'content': '\n\n'},
+        {'type': 'table', 'rows': []},
+    ])
+    assert normalized == [{'type': 'text', 'content': 'a b\n\n'}]
+
+def test_html_to_markdown_output_unchanged_by_normalization():
+    assert html_to_markdown(HTML) == html_to_markdown(HTML, {'normalize_ast': True})
+
+def test_merge_text_preserves_rendering():
+    soup = BeautifulSoup(HTML + '<p><span>Hello</span>, world<span>.</span></p>', 'html.parser')
+    ast = html_to_markdown_ast(soup)
+    merged = html_to_markdown_ast(soup, merge_text=True)
+    assert markdown_ast_to_string(merged) == markdown_ast_to_string(ast)
+    assert html_to_markdown(str(soup), {'plain_text': True}) == html_to_markdown(str(soup), {'plain_text': True, 'normalize_ast': False})
+    assert len(merged) < len(ast)
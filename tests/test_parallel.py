@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+from domscribe import html_to_markdown, html_to_markdown_parallel
+from domscribe.parallel import split_chunks
+from bs4 import BeautifulSoup
+
+SECTIONS = [
+    '<h2>Section {i}</h2><p>See <a href="https://example.com/{i}">page {i}</a> and <b>this</b>.</p>',
+    '<div><div><p>Nested {i}</p><pre><code>x = {i}\n</code></pre></div>loose text {i}</div>',
+    '<span>inline {i}</span> text <code>code {i}</code>',
+    '<ul><li>one {i}</li><li>two <em>{i}</em></li></ul><img src="/{i}.png" alt="image {i}">',
+    '<table><tr><th>Key</th></tr><tr><td>{i}</td></tr></table><blockquote>quote {i}</blockquote>',
+]
+
+HTML = '<html><body>' + '\n'.join(SECTIONS[i % len(SECTIONS)].format(i=i) for i in range(60)) + '</body></html>'
+
+def test_parallel_matches_serial_conversion():
+    for options in [None, {'refify_urls': True}, {'plain_text': True}, {'normalize_ast': False}]:
+        assert html_to_markdown_parallel(HTML, options, max_workers=3, min_size=0) == html_to_markdown(HTML, options)
+
+def test_small_documents_are_converted_serially():
+    assert html_to_markdown_parallel('<p>Hello</p>', max_workers=3) == html_to_markdown('<p>Hello</p>')
+
+def test_split_chunks_covers_all_blocks_in_order():
+    blocks = list(BeautifulSoup(HTML, 'html.parser').body.children)
+    chunks = split_chunks(HTML, blocks, 8)
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(blocks)
+    assert all(previous[1] == current[0] for previous, current in zip(chunks, chunks[1:]))
+    assert 1 < len(chunks) <= 9
+
+def test_parallel_calls_from_several_threads():
+    other = HTML.replace('Section', 'Chapter').replace('example.com', 'example.org')
+    pages = [HTML, other] * 4
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(lambda page: html_to_markdown_parallel(page, max_workers=3, min_size=0), pages))
+    assert results == [html_to_markdown(page) for page in pages]
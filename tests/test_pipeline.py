@@ -0,0 +1,82 @@
+import threading
+import time
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from domscribe import html_to_markdown
+from domscribe.pipeline import fetch_and_convert, create_session
+
+PAGES = {
+    '/one': ('text/html', '<h1>One</h1><p>First page.</p>'.encode('utf-8')),
+    '/two': ('text/html; charset=windows-1252', '<p>Café</p>'.encode('windows-1252')),
+    '/three': ('text/html', '<meta charset="utf-8"><p>Naïve</p>'.encode('utf-8')),
+}
+
+class Handler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        Handler.requests_seen.append(self.path)
+        if self.path not in PAGES:
+            self.send_error(404)
+            return
+        content_type, body = PAGES[self.path]
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+def test_fetch_and_convert(base_url):
+    urls = [base_url + path for path in ['/one', '/two', '/three', '/missing']]
+    results = {result['url']: result for result in fetch_and_convert(urls, per_host_limit=2)}
+    assert set(results) == set(urls)
+    assert results[base_url + '/one']['markdown'] == html_to_markdown('<h1>One</h1><p>First page.</p>')
+    assert results[base_url + '/two']['markdown'] == 'Café\n'
+    assert results[base_url + '/three']['markdown'] == 'Naïve\n'
+    assert results[base_url + '/one']['fetch_seconds'] > 0
+    missing = results[base_url + '/missing']
+    assert missing['status_code'] == 404
+    assert missing['markdown'] is None and missing['error'] == 'HTTP 404'
+
+def test_fetch_and_convert_with_custom_executor(base_url):
+    with ThreadPoolExecutor(2) as executor:
+        results = list(fetch_and_convert([base_url + '/one'] * 5, convert_executor=executor))
+    assert [result['error'] for result in results] == [None] * 5
+
+def test_fetch_and_convert_limits_pages_waiting_for_the_caller(base_url):
+    Handler.requests_seen.clear()
+    results = fetch_and_convert([base_url + '/one'] * 20, fetch_workers=4, max_pending=2)
+    next(results)
+    time.sleep(0.3)
+    assert len(Handler.requests_seen) <= 3
+    start = time.perf_counter()
+    results.close()
+    assert time.perf_counter() - start < 1
+    time.sleep(0.1)
+    assert len(Handler.requests_seen) <= 4
+
+def test_fetch_and_convert_closes_its_session_when_closed_early(base_url):
+    session = create_session()
+    with mock.patch('domscribe.pipeline.create_session', return_value=session), \
+            mock.patch.object(session, 'close', wraps=session.close) as close:
+        results = fetch_and_convert([base_url + '/one'] * 20, fetch_workers=4, max_pending=2)
+        next(results)
+        results.close()
+        deadline = time.perf_counter() + 2
+        while not close.called and time.perf_counter() < deadline:
+            time.sleep(0.01)
+    close.assert_called_once()
@@ -0,0 +1,44 @@
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+import json
+from domscribe import html_to_markdown
+from domscribe.profiling import ConversionCapture, list_captures, replay_captures, compare_reports, main
+
+HTML = "<h1>Title</h1><p>Some <strong>bold</strong> text.</p><ul><li>One</li></ul>"
+
+def test_capture_writes_slow_conversions(tmp_path):
+    capture = ConversionCapture(tmp_path, latency_threshold=0, min_interval=0, max_captures=1)
+    assert capture.html_to_markdown(HTML, {'keep_html': ['span']}) == html_to_markdown(HTML)
+    capture.html_to_markdown(HTML)
+    paths = list_captures(tmp_path)
+    assert len(paths) == 1
+    with open(f'{paths[0]}/capture.json') as f:
+        data = json.load(f)
+    assert data['options'] == {'keep_html': ['span']}
+    assert set(data['timings']) == {'parse', 'select_root', 'build_ast', 'render'}
+
+def test_capture_skips_fast_conversions(tmp_path):
+    capture = ConversionCapture(tmp_path, latency_threshold=60)
+    capture.html_to_markdown(HTML)
+    assert list_captures(tmp_path) == []
+
+def test_replay_reports_modules(tmp_path, capsys):
+    ConversionCapture(tmp_path, latency_threshold=0).html_to_markdown(HTML)
+    report = replay_captures(tmp_path)
+    assert report['pages'] == 1
+    assert 'html_to_markdown_ast' in report['modules']
+    comparison = compare_reports(report, report)
+    assert comparison['html_to_markdown_ast']['ratio'] == 1.0
+
+    baseline = tmp_path / 'baseline.json'
+    main([str(tmp_path), '--save', str(baseline)])
+    main([str(tmp_path), '--baseline', str(baseline)])
+    assert 'baseline' in capsys.readouterr().out
+
+def test_memory_capture_from_several_threads(tmp_path):
+    capture = ConversionCapture(tmp_path, latency_threshold=60, memory_threshold=1, min_interval=0)
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(capture.html_to_markdown, [HTML] * 20))
+    assert results == [html_to_markdown(HTML)] * 20
+    assert not tracemalloc.is_tracing()
+    assert list_captures(tmp_path)
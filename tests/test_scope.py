@@ -0,0 +1,57 @@
+import pytest
+from domscribe import html_to_markdown, html_to_markdown_incremental, html_to_markdown_variants
+
+HTML = """
+<html><body>
+  <nav><a href="/a">Home</a></nav>
+  <div id="content" class="post main">
+    <h1>Title</h1>
+    <p>Body text with <strong>bold</strong>.</p>
+    <pre><code>x = 1</code></pre>
+  </div>
+  <aside class="post">Aside text</aside>
+  <footer>Footer</footer>
+</body></html>
+"""
+
+CONTENT = "# Title\n\nBody text with **bold**.\n\n\n```\nx = 1\n```\n"
+
+@pytest.mark.parametrize("scope", [
+    '#content',
+    'div#content',
+    'div.post.main',
+    {'name': 'div', 'attrs': {'id': 'content'}},
+    'body > div.main',
+])
+def test_scope_converts_matching_subtree(scope):
+    assert html_to_markdown(HTML, {'scope': scope}) == CONTENT
+
+def test_scope_converts_all_matches_in_order():
+    assert html_to_markdown(HTML, {'scope': '.post'}) == CONTENT + "\n\n\nAside text\n"
+
+@pytest.mark.parametrize("scope", ['p', 'P', 'body > p'])
+def test_scope_separates_matches_into_paragraphs(scope):
+    html = '<body><h1>Title</h1><p>A</p><p>B</p><p>C</p></body>'
+    assert html_to_markdown(html, {'scope': scope}) == html_to_markdown('<p>A</p><p>B</p><p>C</p>') == 'A\n\nB\n\nC\n'
+    assert html_to_markdown_incremental(html, None, {'scope': scope})['markdown'] == 'A\n\nB\n\nC\n'
+
+def test_scope_tag_name_is_case_insensitive():
+    assert html_to_markdown(HTML, {'scope': 'DIV.post.main'}) == CONTENT
+    assert html_to_markdown(HTML, {'scope': 'ASIDE'}) == "Aside text\n"
+
+def test_scope_falls_back_to_main_content():
+    expected = html_to_markdown(HTML, {'extract_main_content': True})
+    assert html_to_markdown(HTML, {'scope': 'article'}) == expected
+    assert html_to_markdown(HTML, {'scope': 'body > article'}) == expected
+
+def test_scope_in_incremental_and_variants():
+    options = {'scope': '#content'}
+    assert html_to_markdown_incremental(HTML, None, options)['markdown'] == CONTENT
+    assert html_to_markdown_variants(HTML, {'md': {}, 'text': {'plain_text': True}}, options)['md'] == CONTENT
+
+def test_scope_per_variant():
+    variants = {'aside': {'scope': 'aside'}, 'content': {'scope': '#content'}, 'all': {}, 'missing': {'scope': 'article'}}
+    results = html_to_markdown_variants(HTML, variants)
+    for name, options in variants.items():
+        assert results[name] == html_to_markdown(HTML, options)
+    assert results['aside'] == "Aside text\n"
@@ -0,0 +1,59 @@
+from domscribe import html_to_markdown, MainContentSelectorCache
+
+
+def make_page(n, with_content=True):
+    body = ''.join(f"<p>Paragraph {i} of article {n}, long enough to count as real content.</p>" for i in range(6))
+    return f"""
+    <html><body>
+      <div class="menu"><a href="/a">A</a> <a href="/b">B</a></div>
+      <div class="layout"><div class="article-body">{body if with_content else ''}</div></div>
+      <div class="footer">Footer</div>
+    </body></html>
+    """
+
+def test_selector_cache_learns_and_matches_scoring():
+    cache = MainContentSelectorCache(learn_pages=3)
+    options = {'extract_main_content': True, 'website_domain': 'https://example.com', 'main_content_cache': cache}
+    for n in range(6):
+        html = make_page(n)
+        assert html_to_markdown(html, options) == html_to_markdown(html, {'extract_main_content': True})
+    stats = cache.stats()
+    assert stats['learned'] == 3
+    assert stats['hits'] == 3
+    assert stats['learned_sites'] == 1
+
+def test_selector_cache_falls_back_when_match_is_too_small():
+    cache = MainContentSelectorCache(learn_pages=2)
+    options = {'extract_main_content': True, 'website_domain': 'https://example.com', 'main_content_cache': cache}
+    for n in range(2):
+        html_to_markdown(make_page(n), options)
+    html = make_page(3, with_content=False)
+    assert html_to_markdown(html, options) == html_to_markdown(html, {'extract_main_content': True})
+    assert cache.stats()['fallbacks'] == 1
+
+def test_selector_cache_save_and_load(tmp_path):
+    cache = MainContentSelectorCache(learn_pages=2)
+    options = {'extract_main_content': True, 'website_domain': 'https://example.com', 'main_content_cache': cache}
+    for n in range(2):
+        html_to_markdown(make_page(n), options)
+    path = tmp_path / 'selectors.json'
+    cache.save(path)
+    loaded = MainContentSelectorCache.load(path)
+    assert loaded.sites == cache.sites
+    html_to_markdown(make_page(5), {**options, 'main_content_cache': loaded})
+    assert loaded.stats()['hits'] == 1
+
+def test_selector_cache_keeps_sites_apart():
+    cache = MainContentSelectorCache(learn_pages=2)
+    for n in range(2):
+        html_to_markdown(make_page(n), {'extract_main_content': True, 'website_domain': 'a.example', 'main_content_cache': cache})
+    other = {'extract_main_content': True, 'website_domain': 'b.example', 'main_content_cache': cache}
+    html_to_markdown(make_page(5), other)
+    assert cache.stats()['hits'] == 0
+
+def test_selector_cache_unused_without_domain():
+    cache = MainContentSelectorCache(learn_pages=1)
+    html = make_page(1)
+    assert html_to_markdown(html, {'extract_main_content': True, 'main_content_cache': cache}) == \
+        html_to_markdown(html, {'extract_main_content': True})
+    assert cache.sites == {}
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import threading
+from unittest import mock
+import pytest
+from domscribe import html_to_markdown
+from domscribe.client import ConversionClient, WorkerError
+from domscribe.server import ConversionServer
+
+HTML = "<h1>Title</h1><p>Some <strong>bold</strong> text.</p>"
+
+@pytest.mark.skipif(not hasattr(__import__('socket'), 'AF_UNIX'), reason="requires Unix sockets")
+def test_unix_socket_server_roundtrip(tmp_path):
+    server = ConversionServer(workers=1)
+    socket_server = server.serve_unix_socket(str(tmp_path / 'domscribe.sock'))
+    thread = threading.Thread(target=socket_server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with ConversionClient(str(tmp_path / 'domscribe.sock')) as client:
+            assert client.convert(HTML) == html_to_markdown(HTML)
+            assert client.convert(HTML, {'plain_text': True}) == html_to_markdown(HTML, {'plain_text': True})
+            with pytest.raises(WorkerError):
+                client.convert(None)
+    finally:
+        socket_server.shutdown()
+        socket_server.server_close()
+        server.close()
+
+def test_stdio_server_roundtrip():
+    with ConversionClient.spawn(workers=1) as client:
+        assert client.convert(HTML) == html_to_markdown(HTML)
+
+def test_importing_renderer_does_not_import_bs4():
+    code = "import sys; from domscribe import markdown_ast_to_string; print('bs4' in sys.modules)"
+    env = {**os.environ, 'PYTHONPATH': os.path.dirname(os.path.dirname(os.path.abspath(__file__)))}
+    output = subprocess.check_output([sys.executable, '-c', code], env=env)
+    assert output.strip() == b'False'
+
+def test_stdio_server_keeps_debug_output_off_the_protocol():
+    with ConversionClient.spawn(workers=1) as client:
+        assert client.convert(HTML, {'debug': True}) == html_to_markdown(HTML)
+        assert client.convert(HTML) == html_to_markdown(HTML)
+
+def test_html_to_markdown_ast_can_be_patched():
+    import domscribe
+    original = domscribe.html_to_markdown_ast
+    with mock.patch('domscribe.html_to_markdown_ast', return_value=[]) as patched:
+        assert domscribe.html_to_markdown_ast is patched
+    assert domscribe.html_to_markdown_ast is original
@@ -0,0 +1,43 @@
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import BeautifulSoup
+from domscribe import html_to_markdown, html_to_markdown_ast, markdown_ast_to_string, refify_urls
+
+HTML = """
+<h1>Title</h1>
+<p>See <a href="https://example.com/a">first</a> and <a href="https://example.com/b"><b>second</b></a>.</p>
+<blockquote><p>Quoted <a href="https://example.com/a">again</a>.</p></blockquote>
+<ul><li>Unchanged item</li></ul>
+"""
+
+def build_ast():
+    return html_to_markdown_ast(BeautifulSoup(HTML, 'html.parser'))
+
+def test_refify_urls_does_not_modify_input():
+    ast = build_ast()
+    original = copy.deepcopy(ast)
+    refified = refify_urls(ast)
+    assert ast == original
+    assert refified is not ast
+    assert markdown_ast_to_string(refify_urls(ast)) == markdown_ast_to_string(refified)
+
+def test_refify_urls_shares_unchanged_subtrees():
+    ast = build_ast()
+    refified = refify_urls(ast)
+    heading = next(node for node in ast if node['type'] == 'heading')
+    unordered_list = next(node for node in ast if node['type'] == 'list')
+    assert any(node is heading for node in refified)
+    assert any(node is unordered_list for node in refified)
+
+def test_concurrent_conversions_match_serial():
+    options = {'refify_urls': True}
+    expected = html_to_markdown(HTML, options)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: html_to_markdown(HTML, options), range(32)))
+    assert results == [expected] * 32
+
+    ast = build_ast()
+    expected_render = markdown_ast_to_string(refify_urls(ast))
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        renders = list(pool.map(lambda _: markdown_ast_to_string(refify_urls(ast)), range(32)))
+    assert renders == [expected_render] * 32
@@ -0,0 +1,41 @@
+from domscribe import html_to_markdown, html_to_markdown_variants
+
+HTML = """
+<html><body>
+  <nav><a href="https://example.com/docs/guide/start">Docs</a></nav>
+  <main>
+    <h1>Main Content</h1>
+    <p>Read <a href="https://example.com/a">this</a> and <strong>that</strong>.</p>
+  </main>
+  <footer>Footer content</footer>
+</body></html>
+"""
+
+VARIANTS = {
+    'refified': {'refify_urls': True},
+    'full': {},
+    'main': {'extract_main_content': True},
+    'main_refified': {'extract_main_content': True, 'refify_urls': True},
+    'text': {'plain_text': True},
+}
+
+def test_variants_match_separate_conversions():
+    results = html_to_markdown_variants(HTML, VARIANTS)
+    assert list(results) == list(VARIANTS)
+    for name, options in VARIANTS.items():
+        assert results[name] == html_to_markdown(HTML, options)
+
+def test_refify_variant_does_not_leak_into_shared_ast():
+    results = html_to_markdown_variants(HTML, VARIANTS)
+    assert '[this](https://example.com/a)' in results['full']
+    assert '[this][' in results['refified']
+
+def test_plain_text_variant():
+    results = html_to_markdown_variants(HTML, {'text': {'plain_text': True}}, {'extract_main_content': True})
+    assert results['text'] == "Main Content\n\nRead this and that.\n"
+
+def test_plain_text_variant_sharing_an_ast():
+    html = '<p><span>Hello</span>, world</p>'
+    results = html_to_markdown_variants(html, {'a': {}, 'b': {'refify_urls': True}, 't': {'plain_text': True}})
+    assert results['t'] == html_to_markdown(html, {'plain_text': True}) == 'Hello, world\n'
+    assert results['a'] == results['b'] == html_to_markdown(html)